@@ -0,0 +1,191 @@
+"""Run the dashboard pages headlessly against synthetic data and time them.
+
+    python -m benchmarks.run_pages --rows 10000 100000 1000000 [--json results.jsonl]
+
+For every dataset size this generates a raw dump, ingests it into a scratch
+directory and drives each page through Streamlit's AppTest: a cold load, a
+warm load, then the page's widget interactions. Wall time and peak Python
+heap (tracemalloc) are reported per step. Pages run under the same run
+recorder as in the app (`utils.perf_panel.instrumented_run`), so each step is
+followed by one row per section span it recorded, with that span's wall time
+and peak heap.
+"""
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+from contextlib import contextmanager
+from pathlib import Path
+
+import streamlit as st
+from streamlit.testing.v1 import AppTest
+
+ROOT = Path(__file__).resolve().parent.parent
+if str(ROOT) not in sys.path:
+    sys.path.insert(0, str(ROOT))
+
+from benchmarks.synthetic import generate  # noqa: E402
+from utils.ingest import ingest  # noqa: E402
+from utils.instrumentation import HISTORY, peak_memory  # noqa: E402
+from utils.schema import CATEGORIES_PATH, DATASET_PATH, HIERARCHY_PATH  # noqa: E402
+
+STATIC_FILES = [CATEGORIES_PATH, HIERARCHY_PATH]
+
+# What main.py does around the current page, for a page run on its own.
+PAGE_SCRIPT = """
+import runpy
+
+from utils.perf_panel import instrumented_run
+
+with instrumented_run({page!r}):
+    runpy.run_path({path!r}, run_name='__main__')
+"""
+
+
+def widget(at, kind, label):
+    for element in getattr(at, kind):
+        if (element.label or '').startswith(label):
+            return element
+    raise LookupError(f'no {kind} labelled {label!r}')
+
+
+PAGES = {
+    'overview': ('pages/overview.py', [
+        ('top viewed slider', lambda at: widget(at, 'slider', 'Select number of top viewed').set_value(20)),
+        ('show most viewed', lambda at: widget(at, 'button', '🔍 Show Me').click()),
+    ]),
+    'trends_over_time': ('pages/trends_over_time.py', [
+        ('timezone Asia/Kolkata', lambda at: widget(at, 'selectbox', 'Select your timezone').set_value('Asia/Kolkata')),
+        ('timezone America/New_York', lambda at: widget(at, 'selectbox', 'Select your timezone').set_value('America/New_York')),
+    ]),
+    'key_concepts_functions': ('pages/key_concepts_functions.py', [
+        ('deep dive category', lambda at: widget(at, 'selectbox', 'Select a DAX category').set_value('Filter functions')),
+        ('hierarchy root', lambda at: widget(at, 'selectbox', 'Start from').set_value('Time Intelligence')),
+        ('hierarchy icicle', lambda at: widget(at, 'radio', 'Chart').set_value('Icicle')),
+        ('network top N', lambda at: widget(at, 'slider', 'Select top N functions').set_value(30)),
+        ('network mode', lambda at: widget(at, 'radio', 'Select mode').set_value('Free Select Functions')),
+        ('explore top questions', lambda at: widget(at, 'button', '🔍 Show Me').click()),
+    ]),
+    'search': ('pages/search.py', [
+        ('search query', lambda at: widget(at, 'text_input', 'Search questions').input('CALCULATE total')),
+        ('search by function', lambda at: widget(at, 'selectbox', 'DAX function').set_value('FILTER')),
+    ]),
+}
+
+
+@contextmanager
+def workspace(rows, seed):
+    """Scratch directory laid out like the repo's data/ folder, made the cwd."""
+    previous = os.getcwd()
+    with tempfile.TemporaryDirectory(prefix=f'dax-bench-{rows}-') as tmp:
+        (Path(tmp) / 'data').mkdir()
+        for name in STATIC_FILES:
+            shutil.copy(ROOT / name, Path(tmp) / name)
+        raw = generate(rows, str(Path(tmp) / 'data' / 'raw.parquet'), seed=seed)
+        os.chdir(tmp)
+        try:
+            started = time.perf_counter()
+            ingest(raw, DATASET_PATH)
+            yield time.perf_counter() - started
+        finally:
+            os.chdir(previous)
+
+
+def measure(step):
+    # Spans reset tracemalloc's peak too; peak_memory accounts for that.
+    with peak_memory() as peak:
+        started = time.perf_counter()
+        result = step()
+        elapsed = time.perf_counter() - started
+    return result, elapsed, peak['bytes']
+
+
+def recorded(step):
+    """`measure(step)` plus the runs the page recorded meanwhile (the page, and any section rerun on its own)."""
+    before = {id(recorder) for recorder in HISTORY.runs}
+    result, elapsed, peak = measure(step)
+    return result, elapsed, peak, [recorder for recorder in HISTORY.runs if id(recorder) not in before]
+
+
+def run_page(page, path, interactions, timeout):
+    def load():
+        return AppTest.from_string(PAGE_SCRIPT.format(page=page, path=str(ROOT / path)), default_timeout=timeout).run()
+
+    at, elapsed, peak, runs = recorded(load)
+    yield 'cold load', elapsed, peak, runs, at
+    at, elapsed, peak, runs = recorded(load)
+    yield 'warm load', elapsed, peak, runs, at
+    for name, interact in interactions:
+        at, elapsed, peak, runs = recorded(lambda: interact(at).run())
+        yield name, elapsed, peak, runs, at
+
+
+def benchmark(sizes, pages, seed=0, timeout=600):
+    tracemalloc.start()
+    try:
+        for rows in sizes:
+            st.cache_data.clear()
+            st.cache_resource.clear()
+            with workspace(rows, seed) as ingest_seconds:
+                yield {'rows': rows, 'page': 'ingest', 'step': 'ingest', 'section': None, 'seconds': ingest_seconds, 'peak_mb': None, 'errors': []}
+                for page in pages:
+                    path, interactions = PAGES[page]
+                    for step, elapsed, peak, runs, at in run_page(page, path, interactions, timeout):
+                        yield {
+                            'rows': rows,
+                            'page': page,
+                            'step': step,
+                            'section': None,
+                            'seconds': elapsed,
+                            'peak_mb': peak / 2 ** 20,
+                            'errors': [str(e.value).splitlines()[0] for e in at.exception],
+                        }
+                        for recorder in runs:
+                            for s in sorted(recorder.spans, key=lambda s: s.start):
+                                yield {
+                                    'rows': rows,
+                                    'page': page,
+                                    'step': step,
+                                    'section': s.path,
+                                    'seconds': s.seconds,
+                                    'peak_mb': s.peak_bytes / 2 ** 20,
+                                    'errors': [],
+                                }
+    finally:
+        tracemalloc.stop()
+
+
+def format_row(result):
+    peak = '' if result['peak_mb'] is None else f"{result['peak_mb']:9.1f}"
+    errors = f"  ERROR: {result['errors'][0]}" if result['errors'] else ''
+    step = result['step'] if result['section'] is None else f"  {result['section']}"
+    return f"{result['rows']:>10,}  {result['page']:<24} {step:<40} {result['seconds']:8.3f}s {peak:>9}{errors}"
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the dashboard pages on synthetic data.')
+    parser.add_argument('--rows', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--pages', nargs='+', choices=list(PAGES), default=list(PAGES))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--timeout', type=float, default=600)
+    parser.add_argument('--json', help='append results as JSON lines to this file')
+    args = parser.parse_args(argv)
+
+    print(f"{'rows':>10}  {'page':<24} {'step / section':<40} {'wall':>9} {'peak MB':>9}")
+    output = open(args.json, 'a') if args.json else None
+    try:
+        for result in benchmark(args.rows, args.pages, args.seed, args.timeout):
+            print(format_row(result), flush=True)
+            if output:
+                output.write(json.dumps(result) + '\n')
+    finally:
+        if output:
+            output.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,118 @@
+"""Synthetic Stack Overflow dumps in the raw schema, for benchmarking.
+
+    python -m benchmarks.synthetic --rows 1000000 --output /tmp/dax/data.parquet
+
+Rows are generated in chunks and streamed to Parquet, so 10M-row dumps do
+not need 10M rows in memory. Function, author and industry popularity follow
+Zipf-like distributions so the aggregations see a realistic long tail.
+"""
+import argparse
+import json
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from utils.schema import CATEGORIES_PATH, HIERARCHY_PATH
+
+
+INDUSTRIES = [
+    'Finance', 'Retail', 'Healthcare', 'Manufacturing', 'Education', 'Government',
+    'Energy', 'Logistics', 'Telecommunications', 'Insurance', 'Hospitality', 'Media',
+]
+DIFFICULTY = ['beginner', 'intermediate', 'advanced', 'NA', '']
+START = np.datetime64('2009-06-01T00:00:00')
+END = np.datetime64('2024-09-01T00:00:00')
+
+
+def zipf_weights(n, exponent=1.1):
+    weights = 1.0 / np.arange(1, n + 1) ** exponent
+    return weights / weights.sum()
+
+
+class Vocabulary:
+    def __init__(self, categories_path=CATEGORIES_PATH, hierarchy_path=HIERARCHY_PATH, seed=0):
+        with open(categories_path) as f:
+            categories = json.load(f)
+        with open(hierarchy_path) as f:
+            self.concepts = list(json.load(f)['Concepts'])
+        rng = np.random.default_rng(seed)
+        self.functions = np.array(sorted({fn for fns in categories.values() for fn in fns}), dtype=object)
+        rng.shuffle(self.functions)
+        self.category_of = {fn: c for c, fns in categories.items() for fn in fns}
+        self.authors = np.array([f'user{i}' for i in range(5000)] + ['Anonymous'], dtype=object)
+
+
+def _pick_lists(rng, n, vocabulary, max_items, weights):
+    lengths = rng.integers(0, max_items + 1, n)
+    picks = rng.choice(len(vocabulary), size=lengths.sum(), p=weights)
+    offsets = np.concatenate([[0], np.cumsum(lengths)])
+    return [list(dict.fromkeys(vocabulary[picks[a:b]])) for a, b in zip(offsets[:-1], offsets[1:])]
+
+
+def generate_chunk(rng, start_id, n, vocab):
+    functions = _pick_lists(rng, n, vocab.functions, 5, zipf_weights(len(vocab.functions)))
+    concepts = _pick_lists(rng, n, np.array(vocab.concepts, dtype=object), 2, zipf_weights(len(vocab.concepts), 0.8))
+    industries = _pick_lists(rng, n, np.array(INDUSTRIES, dtype=object), 1, zipf_weights(len(INDUSTRIES), 0.7))
+    categories = [sorted({vocab.category_of[fn] for fn in fns}) for fns in functions]
+
+    span = (END - START).astype('timedelta64[s]').astype(np.int64)
+    # Later years get more questions, like the real tag.
+    asked = START + (span * np.sqrt(rng.random(n))).astype('timedelta64[s]')
+    answered = asked + rng.exponential(36 * 3600, n).astype('timedelta64[s]')
+    modified = asked + rng.exponential(30 * 86400, n).astype('timedelta64[s]')
+    views = np.rint(rng.lognormal(6.5, 1.6, n)).astype(np.int64)
+    ids = np.arange(start_id, start_id + n)
+    authors = vocab.authors[rng.choice(len(vocab.authors), n, p=zipf_weights(len(vocab.authors), 0.9))]
+
+    first = [fns[0] if fns else 'SUM' for fns in functions]
+    return pd.DataFrame({
+        'URL': [f'https://stackoverflow.com/questions/{i}/synthetic-question-{i}' for i in ids],
+        'Asked Date': pd.to_datetime(asked).strftime('%Y-%m-%d %H:%M:%S'),
+        'Modified Date': pd.to_datetime(modified).strftime('%Y-%m-%d %H:%M:%S'),
+        'Views': [f'{v:,}' for v in views],
+        'Votes': np.rint(rng.normal(2, 6, n)).astype(np.int64),
+        'Number of Answers': rng.poisson(1.4, n),
+        'Highest Score Answer Score': rng.poisson(3, n),
+        'Highest Score Answer Author': authors,
+        'Highest Score Answer Date': pd.to_datetime(answered).strftime('%Y-%m-%d %H:%M:%S'),
+        'DAX Functions in Question': [repr(v) for v in functions],
+        'Categories in Question': [repr(v) for v in categories],
+        'concepts': [repr(v) for v in concepts],
+        'industries': [repr(v) for v in industries],
+        'difficulty_level': rng.choice(DIFFICULTY, n, p=[0.35, 0.35, 0.2, 0.05, 0.05]),
+        'context': [f'How can I use {" with ".join(fns) or "a measure"} to get the right total? (#{i})' for fns, i in zip(functions, ids)],
+        'dax_code_provided': [f"Measure {i} =\nVAR Result = {fn}(Sales[Amount])\nRETURN Result" for fn, i in zip(first, ids)],
+        'correct_answer': [f"Fixed =\nCALCULATE({fn}(Sales[Amount]), ALL('Date'))" for fn in first],
+    })
+
+
+def generate(rows, output, seed=0, chunk_size=250_000):
+    rng = np.random.default_rng(seed)
+    vocab = Vocabulary(seed=seed)
+    writer = None
+    try:
+        for start in range(0, rows, chunk_size):
+            chunk = generate_chunk(rng, 1_000_000 + start, min(chunk_size, rows - start), vocab)
+            table = pa.Table.from_pandas(chunk, preserve_index=False)
+            if writer is None:
+                writer = pq.ParquetWriter(output, table.schema, compression='zstd')
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+    return output
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Write a synthetic raw DAX questions dump.')
+    parser.add_argument('--rows', type=int, default=10_000)
+    parser.add_argument('--output', default='data/synthetic.parquet')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args(argv)
+    print(generate(args.rows, args.output, args.seed))
+
+
+if __name__ == '__main__':
+    main()
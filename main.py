@@ -1,9 +1,13 @@
 import streamlit as st
 
+from utils.filter_bar import render_filter_bar
+from utils.perf_panel import instrumented_run, render_panel
+
 pages = [
     st.Page("pages/overview.py", title="Overview", icon="📊"),
     st.Page("pages/trends_over_time.py", title="Trends over Time", icon="⏳"),
     st.Page("pages/key_concepts_functions.py", title="Key Concepts and Functions", icon="🔑"),
+    st.Page("pages/search.py", title="Search Questions", icon="🔍"),
     st.Page("pages/learning_path.py", title="Learning Path", icon="🛤️"),
 ]
 
@@ -16,4 +20,9 @@ st.set_page_config(
     initial_sidebar_state="expanded"
 )
 
-current_page.run()
+with instrumented_run(current_page.title) as recorder:
+    render_filter_bar()
+    current_page.run()
+
+render_panel(recorder)
+
@@ -1,20 +1,20 @@
-from collections import Counter
-from collections import defaultdict
+import json
+
 from streamlit_echarts import st_echarts
-import ast
-import networkx as nx
-import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
 import streamlit as st
-import json
 
-@st.cache_data
-def load_data():
-    df = pd.read_csv('data/data.csv')
-    return df
+from utils import analytics
+from utils.cooccurrence import METRICS
+from utils.data_loader import get_dataset
+from utils.categories import function_categories
+from utils.graph_layout import LAYOUTS
+from utils.instrumentation import span
+from utils.perf_panel import cached_chart, cached_figure, section
+from utils.question_card import render_question
 
-df = load_data()
+dataset = get_dataset()
 
 st.markdown("""
     # Concepts and Functions Analysis
@@ -34,38 +34,27 @@ st.markdown("---")
 
 st.header("🎭 DAX Categories Challenge Spectrum")
 
-def safe_eval(x):
-    try:
-        return ast.literal_eval(x)
-    except ValueError:
-        return []
-
-df['Categories in Question'] = df['Categories in Question'].apply(safe_eval)
-
-df_exploded_categories = df['Categories in Question'].explode()
-
-df_exploded_categories = df_exploded_categories[df_exploded_categories.notna()]
-
-category_counts = df_exploded_categories.value_counts().reset_index(name='Counts')
-category_counts.columns = ['Category', 'Counts']
-category_counts = category_counts.sort_values(by='Counts', ascending=False)
+with span("Categories Spectrum"):
+    def categories_chart():
+        category_counts = analytics.counts(dataset, 'category').rename_axis('Category').reset_index(name='Counts')
 
-fig_categories = px.bar(
-    category_counts,
-    x='Category',
-    y='Counts',
-    labels={'Category': 'Categories', 'Counts': 'Frequency'},
-    title='DAX Categories by Frequency of Questions'
-)
+        fig_categories = px.bar(
+            category_counts,
+            x='Category',
+            y='Counts',
+            labels={'Category': 'Categories', 'Counts': 'Frequency'},
+            title='DAX Categories by Frequency of Questions'
+        )
 
-fig_categories.update_layout(
-    xaxis_title="Categories",
-    yaxis_title="Frequency"
-)
+        fig_categories.update_layout(
+            xaxis_title="Categories",
+            yaxis_title="Frequency"
+        )
+        return fig_categories
 
-st.plotly_chart(fig_categories, use_container_width=True)
+    cached_chart(dataset, "DAX Categories by Frequency", categories_chart, use_container_width=True)
 
-st.markdown("""
+    st.markdown("""
     This chart illustrates which DAX categories users encounter most frequently in their questions and challenges. The taller the bar, the more questions and discussions we see around that category.
 
     🔍 What This Means for You:
@@ -77,86 +66,133 @@ st.markdown("""
 
     Remember: Frequency of questions often correlates with the importance and complexity of a category. Mastering these key areas will significantly enhance your DAX proficiency! 💪📊
 """)
-st.info("""
+    st.info("""
             **Pro Tip:** Use this chart as a guide to structure your DAX learning. Focus on mastering the most frequent categories first, then progress to the less common ones. This approach will help you tackle the most relevant DAX challenges effectively.
 """)
 
 st.markdown("---")
 
-with open('data/dax-categories.json') as f:
-    dax_categories = json.load(f)
-
-st.header("🔍 DAX Function Deep Dive by Category")
+dax_categories = function_categories()
+category_usage = dataset.category_usage()
 
-selected_category = st.selectbox(
-    "Select a DAX category to explore:",
-    options=list(dax_categories.keys()),
-    index=0
-)
+@section("Function Deep Dive")
+def function_deep_dive():
+    st.header("🔍 DAX Function Deep Dive by Category")
 
-def get_function_counts(category):
-    functions = dax_categories[category]
-    
-    df['DAX Functions in Question'] = df['DAX Functions in Question'].apply(safe_eval)
-    
-    df_exploded = df.explode('DAX Functions in Question')
-    
-    df_category = df_exploded[df_exploded['DAX Functions in Question'].isin(functions)]
-    
-    function_counts = df_category['DAX Functions in Question'].value_counts()
-    
-    return function_counts
+    selected_category = st.selectbox(
+        "Select a DAX category to explore:",
+        options=dax_categories.categories,
+        index=0
+    )
 
-function_counts = get_function_counts(selected_category)
+    def usage_chart():
+        function_counts = analytics.category_usage(dataset, selected_category)
 
-fig = px.bar(
-    x=function_counts.index,
-    y=function_counts.values,
-    labels={'x': 'Function', 'y': 'Frequency'},
-    title=f'Function Usage in {selected_category} Category'
-)
+        fig = px.bar(
+            x=function_counts.index,
+            y=function_counts.values,
+            labels={'x': 'Function', 'y': 'Frequency'},
+            title=f'Function Usage in {selected_category} Category'
+        )
 
-fig.update_layout(
-    xaxis_title="DAX Functions",
-    yaxis_title="Frequency of Use",
-    xaxis_tickangle=-45
-)
+        fig.update_layout(
+            xaxis_title="DAX Functions",
+            yaxis_title="Frequency of Use",
+            xaxis_tickangle=-45
+        )
+        return fig
 
-st.plotly_chart(fig, use_container_width=True)
+    cached_chart(dataset, "Function Usage by Category", usage_chart, {'category': selected_category}, use_container_width=True)
 
-st.info("""
+    st.info("""
         Remember, frequency doesn't always equate to importance for your specific needs. Some less frequent functions 
     might be crucial for particular analyses or industries.
 """)
 
-df['Asked Date'] = pd.to_datetime(df['Asked Date'])
+    if not category_usage.unknown.empty:
+        with st.expander(f"⚠️ {len(category_usage.unknown)} functions appear in questions but not in any category"):
+            st.dataframe(category_usage.unknown.rename_axis('Function').reset_index(name='Questions'), hide_index=True)
+
+
+function_deep_dive()
 
 st.markdown("---")
 
-df = load_data()
+@section("Concept Hierarchy")
+def concept_hierarchy():
+    st.header("🌳 From Concepts to Categories to Functions")
+
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        root = st.selectbox(
+            "Start from:",
+            options=[None, *analytics.hierarchy(dataset, depth=2)['id']],
+            format_func=lambda node: node.replace('/', ' › ') if node else "All concepts",
+            key="hierarchy_root"
+        )
+    with col2:
+        chart_type = st.radio("Chart:", ["Sunburst", "Icicle"], horizontal=True, key="hierarchy_chart")
+
+    def hierarchy_chart():
+        nodes = analytics.hierarchy(dataset, root)
+        levels = dataset.hierarchy().difficulty_levels
+        shares = nodes[list(levels)].div(nodes['questions'].where(nodes['questions'] > 0), axis=0).fillna(0)
+        mix = [
+            ', '.join(f"{level} {share:.0%}" for level, share in zip(levels, row))
+            for row in shares.to_numpy()
+        ]
+
+        trace = go.Sunburst if chart_type == "Sunburst" else go.Icicle
+        fig = go.Figure(trace(
+            ids=nodes['id'],
+            labels=nodes['label'],
+            parents=nodes['parent'],
+            values=nodes['mentions'],
+            branchvalues='total',
+            maxdepth=2,
+            customdata=list(zip(nodes['questions'], nodes['views'], mix)),
+            hovertemplate="<b>%{label}</b><br>Questions: %{customdata[0]:,}<br>Views: %{customdata[1]:,.0f}<br>Difficulty: %{customdata[2]}<extra></extra>",
+        ))
+        fig.update_layout(
+            title=f"DAX Hierarchy: {root.replace('/', ' › ') if root else 'All concepts'}",
+            margin=dict(t=50, l=10, r=10, b=10),
+            height=650
+        )
+        return fig
+
+    cached_chart(dataset, "Concept Hierarchy", hierarchy_chart, {'root': root, 'chart': chart_type}, use_container_width=True)
+
+    st.info("""
+        Click a concept or category to drill into it, and click the centre (or top bar) to go back up. Sector sizes add up the
+    questions of every function below them; hover for the number of distinct questions, their views and their difficulty mix.
+""")
 
-st.header("🔧 The DAX Function Toolbox")
 
-df['DAX Functions'] = df['DAX Functions in Question'].apply(safe_eval)
-all_functions = [func for funcs in df['DAX Functions'] for func in funcs if func]
-function_counts = Counter(all_functions)
-top_functions = function_counts.most_common(20)
+concept_hierarchy()
+
+st.markdown("---")
+
+st.header("🔧 The DAX Function Toolbox")
 
-treemap_data = pd.DataFrame(top_functions, columns=['Function', 'Count'])
+with span("Function Toolbox"):
+    def toolbox_chart():
+        function_counts = analytics.counts(dataset, 'function')
+        treemap_data = function_counts.head(20).rename('Count').rename_axis('Function').reset_index()
 
-fig_functions = px.treemap(
-    treemap_data,
-    path=['Function'],
-    values='Count',
-    title='Top 20 DAX Functions',
-)
+        fig_functions = px.treemap(
+            treemap_data,
+            path=['Function'],
+            values='Count',
+            title='Top 20 DAX Functions',
+        )
 
-fig_functions.update_traces(textinfo="label+value")
-fig_functions.update_layout(margin=dict(t=50, l=25, r=25, b=25))
+        fig_functions.update_traces(textinfo="label+value")
+        fig_functions.update_layout(margin=dict(t=50, l=25, r=25, b=25))
+        return fig_functions
 
-st.plotly_chart(fig_functions, use_container_width=True)
+    cached_chart(dataset, "Top 20 DAX Functions", toolbox_chart, use_container_width=True)
 
-st.info("""
+    st.info("""
         **Learning Tip:** Start with the largest boxes and work your way down. As you master these common functions, 
     you'll be equipped to handle a wide range of DAX scenarios!
 """)
@@ -165,228 +201,210 @@ st.markdown("---")
 
 st.header("📈 The DAX Function Time Machine")
 
-df['Year'] = pd.to_datetime(df['Asked Date']).dt.year
-function_trends = df.explode('DAX Functions').groupby(['Year', 'DAX Functions']).size().unstack(fill_value=0)
-
-selected_functions = st.multiselect(
-    'Select DAX functions to view trends',
-    options=function_trends.columns,
-    default=function_trends.sum().nlargest(3).index.tolist()
-)
+@section("Function Time Machine")
+def function_time_machine():
+    function_trends = analytics.timeseries(dataset, 'questions', grain='year', dimension='function')
+    function_trends.index = function_trends.index.year
 
-if selected_functions:
-    fig_trends = px.line(
-        function_trends[selected_functions],
-        labels={'value': 'Frequency', 'Year': 'Year'},
-        title='DAX Function Usage Trends'
-    )
-    fig_trends.update_layout(
-        xaxis_title="Year",
-        yaxis_title="Frequency"
+    selected_functions = st.multiselect(
+        'Select DAX functions to view trends',
+        options=function_trends.columns,
+        default=function_trends.sum().nlargest(3).index.tolist()
     )
-    st.plotly_chart(fig_trends, use_container_width=True)
 
-else:
-    st.write("Please select at least one function to view its trend.")
+    if selected_functions:
+        def trends_chart():
+            fig_trends = px.line(
+                function_trends[selected_functions],
+                labels={'value': 'Frequency', 'Year': 'Year'},
+                title='DAX Function Usage Trends'
+            )
+            fig_trends.update_layout(
+                xaxis_title="Year",
+                yaxis_title="Frequency"
+            )
+            return fig_trends
 
-st.markdown("---")
+        cached_chart(dataset, "Function Usage Trends", trends_chart, {'functions': selected_functions}, use_container_width=True)
 
-def safe_eval(x):
-    try:
-        return ast.literal_eval(x)
-    except:
-        return []
+    else:
+        st.write("Please select at least one function to view its trend.")
 
-df['DAX Functions in Question'] = df['DAX Functions in Question'].apply(safe_eval)
 
-function_usage = defaultdict(int)
-function_co_occurrence = defaultdict(int)
+function_time_machine()
 
-for functions in df['DAX Functions in Question']:
-    for func in functions:
-        function_usage[func] += 1
-    for i, func1 in enumerate(functions):
-        for func2 in functions[i+1:]:
-            if func1 < func2:
-                function_co_occurrence[(func1, func2)] += 1
-            else:
-                function_co_occurrence[(func2, func1)] += 1
+st.markdown("---")
 
-st.title("DAX Function Co-occurrence Network")
+@section("Co-occurrence Network")
+def cooccurrence_network():
+    function_usage = analytics.function_usage(dataset)
 
-mode = st.radio("Select mode:", ["Top N Functions", "Free Select Functions"])
+    st.title("DAX Function Co-occurrence Network")
 
-if mode == "Top N Functions":
-    max_functions = min(50, len(function_usage))
-    top_n = st.slider("Select top N functions to visualize:", min_value=5, max_value=max_functions, value=20, step=1)
-    
-    top_functions = sorted(function_usage.items(), key=lambda x: x[1], reverse=True)[:top_n]
-    selected_functions = [func for func, _ in top_functions]
-else:
-    all_functions = sorted(function_usage.keys())
-    default_functions = [func for func, _ in sorted(function_usage.items(), key=lambda x: x[1], reverse=True)[:10]]
-    selected_functions = st.multiselect(
-        "Select DAX functions to visualize:",
-        options=all_functions,
-        default=default_functions
-    )
+    mode = st.radio("Select mode:", ["Top N Functions", "Free Select Functions"])
 
-filtered_co_occurrence = {(func1, func2): count 
-                          for (func1, func2), count in function_co_occurrence.items() 
-                          if func1 in selected_functions and func2 in selected_functions}
-
-G = nx.Graph()
-for func in selected_functions:
-    G.add_node(func, size=function_usage[func])
-
-for (func1, func2), count in filtered_co_occurrence.items():
-    G.add_edge(func1, func2, weight=count)
-
-pos = nx.spring_layout(G)
-
-nodes = [
-    {
-        "name": func,
-        "symbolSize": min(20 + function_usage[func] / 5, 50),
-        "x": pos[func][0] * 1000,
-        "y": pos[func][1] * 1000,
-        "value": function_usage[func],
-        "category": func
-    } for func in selected_functions
-]
-
-edges = [
-    {
-        "source": func1,
-        "target": func2,
-        "lineStyle": {
-            "width": min(1 + count / 10, 5)
-        }
-    } for (func1, func2), count in filtered_co_occurrence.items()
-]
-
-option = {
-    "title": {
-        "text": f"DAX Function Co-occurrence in Questions ({mode})"
-    },
-    "tooltip": {},
-    "animationDurationUpdate": 1500,
-    "animationEasingUpdate": "quinticInOut",
-    "series": [{
-        "type": "graph",
-        "layout": "none",
-        "data": nodes,
-        "links": edges,
-        "roam": True,
-        "label": {
-            "show": True,
-            "position": "right",
-            "formatter": "{b}"
-        },
-        "emphasis": {
-            "focus": "adjacency",
-            "lineStyle": {
-                "width": 10
-            }
-        },
-        "lineStyle": {
-            "curveness": 0.3
+    if mode == "Top N Functions":
+        max_functions = min(50, len(function_usage))
+        top_n = st.slider("Select top N functions to visualize:", min_value=5, max_value=max_functions, value=20, step=1)
+    
+        selected_functions = analytics.top_functions(dataset, top_n)
+    else:
+        all_functions = sorted(function_usage.index)
+        default_functions = analytics.top_functions(dataset, 10)
+        selected_functions = st.multiselect(
+            "Select DAX functions to visualize:",
+            options=all_functions,
+            default=default_functions
+        )
+
+    col1, col2 = st.columns(2)
+    with col1:
+        edge_metric = st.selectbox(
+            "Edge weight:",
+            options=list(METRICS),
+            format_func=METRICS.get
+        )
+    with col2:
+        min_weight = st.number_input(
+            "Hide edges with a weight below:",
+            value=None,
+            step=0.1,
+            placeholder="Show all edges",
+            help="Lift above 1 (PMI above 0) means two functions appear together more often than chance."
+        )
+
+    def network_option():
+        filtered_co_occurrence = analytics.cooccurrence_edges(dataset, selected_functions, metric=edge_metric, min_weight=min_weight)
+
+        pos = LAYOUTS.layout(
+            selected_functions,
+            zip(filtered_co_occurrence['source'], filtered_co_occurrence['target'], filtered_co_occurrence['count'])
+        )
+
+        # ECharts options are sent through json.dumps, so numpy scalars become Python numbers here.
+        nodes = [
+            {
+                "name": func,
+                "symbolSize": float(min(20 + function_usage[func] / 5, 50)),
+                "x": float(pos[func][0] * 1000),
+                "y": float(pos[func][1] * 1000),
+                "value": int(function_usage[func]),
+                "category": func
+            } for func in selected_functions
+        ]
+
+        if edge_metric == 'count':
+            edge_widths = (1 + filtered_co_occurrence['weight'] / 10).clip(upper=5)
+        else:
+            edge_widths = 1 + 4 * filtered_co_occurrence['weight'].clip(lower=0) / max(filtered_co_occurrence['weight'].max(), 1e-9)
+
+        edges = [
+            {
+                "source": edge.source,
+                "target": edge.target,
+                "value": round(float(edge.weight), 3),
+                "lineStyle": {
+                    "width": float(width)
+                }
+            } for edge, width in zip(filtered_co_occurrence.itertuples(), edge_widths.tolist())
+        ]
+
+        option = {
+            "title": {
+                "text": f"DAX Function Co-occurrence in Questions ({mode})"
+            },
+            "tooltip": {},
+            "animationDurationUpdate": 1500,
+            "animationEasingUpdate": "quinticInOut",
+            "series": [{
+                "type": "graph",
+                "layout": "none",
+                "data": nodes,
+                "links": edges,
+                "roam": True,
+                "label": {
+                    "show": True,
+                    "position": "right",
+                    "formatter": "{b}"
+                },
+                "emphasis": {
+                    "focus": "adjacency",
+                    "lineStyle": {
+                        "width": 10
+                    }
+                },
+                "lineStyle": {
+                    "curveness": 0.3
+                }
+            }]
         }
-    }]
-}
+        # The component mount json.dumps the option; round-tripping once here
+        # means a stray numpy value fails when the option is built, not on every render.
+        return json.loads(json.dumps(option))
 
-st_echarts(options=option, height="700px")
+    option = cached_figure(dataset, "Co-occurrence Network", network_option, {
+        'mode': mode, 'functions': selected_functions, 'metric': edge_metric, 'min_weight': min_weight,
+    })
 
-st.info(f"This graph shows the co-occurrence of the selected DAX functions in questions. "
-        "The size of each node represents the frequency of the function's usage, "
-        "and the thickness of the edges represents how often two functions appear together.")
+    st_echarts(options=option, height="700px")
 
-st.markdown("### How to interpret this visualization:")
-st.markdown("- Each node represents a selected DAX function.")
-st.markdown("- The size of a node indicates how frequently the function is used.")
-st.markdown("- Edges between nodes show that these functions often appear together in questions.")
-st.markdown("- Thicker edges indicate stronger co-occurrence between functions.")
-st.markdown("- You can zoom and pan the graph using your mouse or touchpad.")
-st.markdown(f"- Use the {mode.lower()} to adjust which functions are displayed.")
+    st.info(f"This graph shows the co-occurrence of the selected DAX functions in questions. "
+            "The size of each node represents the frequency of the function's usage, "
+            "and the thickness of the edges represents how often two functions appear together.")
 
-st.markdown("---")
+    st.markdown("### How to interpret this visualization:")
+    st.markdown("- Each node represents a selected DAX function.")
+    st.markdown("- The size of a node indicates how frequently the function is used.")
+    st.markdown("- Edges between nodes show that these functions often appear together in questions.")
+    st.markdown("- Thicker edges indicate stronger co-occurrence between functions.")
+    st.markdown("- You can zoom and pan the graph using your mouse or touchpad.")
+    st.markdown(f"- Use the {mode.lower()} to adjust which functions are displayed.")
 
-df['Asked Date'] = pd.to_datetime(df['Asked Date'])
 
-with open('data/dax-categories.json') as f:
-    dax_categories = json.load(f)
+cooccurrence_network()
 
-with st.container(border=True):
-    st.subheader("🔍 Explore Top Questions for a DAX Function")
+st.markdown("---")
 
-    selected_category = st.selectbox(
-        "Select a DAX category to explore:",
-        options=list(dax_categories.keys()),
-        index=0,
-        key="category_select"
-    )
+@section("Explore Top Questions")
+def explore_top_questions():
+    with st.container(border=True):
+        st.subheader("🔍 Explore Top Questions for a DAX Function")
+
+        selected_category = st.selectbox(
+            "Select a DAX category to explore:",
+            options=dax_categories.categories,
+            index=0,
+            key="category_select"
+        )
+
+        category_functions = dax_categories.functions_in(selected_category)
+
+        selected_function = st.selectbox(
+            "Select a DAX function:",
+            options=category_functions,
+            index=0,
+            key="function_select"
+        )
+
+        num_questions = st.slider(
+            "Select number of top viewed questions to display", 
+            min_value=1, 
+            max_value=10, 
+            value=3,
+            key="question_slider"
+        )
+        
+        if st.button("🔍 Show Me", key="show_button"):
+            top_views = analytics.top_questions(dataset, num_questions, selected_function)
 
-    category_functions = dax_categories[selected_category]
+            if not top_views.empty:
+                for idx, (index, row) in enumerate(top_views.iterrows()):
+                    render_question(row, f"Question {idx + 1}:")
+            else:
+                st.write(f"No questions found using the {selected_function} function.")
 
-    selected_function = st.selectbox(
-        "Select a DAX function:",
-        options=category_functions,
-        index=0,
-        key="function_select"
-    )
+        # Clicking reruns the section, which clears the questions shown above.
+        st.button("🔄 Okay, I'm done", key="clear_button")
 
-    num_questions = st.slider(
-        "Select number of top viewed questions to display", 
-        min_value=1, 
-        max_value=10, 
-        value=3,
-        key="question_slider"
-    )
-        
-    if st.button("🔍 Show Me", key="show_button"):
-        function_questions = df[df['DAX Functions in Question'].apply(lambda x: selected_function in x)]
-        
-        function_questions['Views'] = pd.to_numeric(function_questions['Views'].str.replace(',', ''), errors='coerce')
-        
-        function_questions = function_questions.dropna(subset=['Views'])
-        
-        top_views = function_questions.nlargest(num_questions, 'Views')[['context', 'dax_code_provided', 'correct_answer', 'concepts', 'Asked Date', 'Views', 'Number of Answers', 'URL']]
-
-        if not top_views.empty:
-            for idx, (index, row) in enumerate(top_views.iterrows()):
-                st.markdown(f"### Question {idx + 1}:")
-
-                col1, col2, col3, col4 = st.columns([1.5, 1, 0.7, 2])
-
-                with col1:
-                    with st.container(border=True):
-                        st.markdown(f"**Asked Date:** {row['Asked Date'].strftime('%Y-%m-%d')}")
-                
-                with col2:
-                    with st.container(border=True):
-                        st.markdown(f"**Views:** {format(int(row['Views']), ',')}")
-
-                with col3:
-                    with st.container(border=True):
-                        st.markdown(f"**Answers:** {row['Number of Answers']}")
-
-                with col4:
-                    with st.container(border=True):
-                        st.markdown(f"**Concepts**: {row['concepts']}")
-
-                st.write(row['context'])
-                
-                if row['dax_code_provided']:
-                    st.code(row['dax_code_provided'], language='sql')
-                
-                if row['correct_answer']:
-                    st.markdown(f"#### Correct Answer:")
-                    st.code(row['correct_answer'], language='sql')
-                
-                st.markdown(f"[View original post]({row['URL']})", unsafe_allow_html=True)
-                st.markdown("---")
-        else:
-            st.write(f"No questions found using the {selected_function} function.")
 
-    if st.button("🔄 Okay, I'm done", key="clear_button"):
-        st.experimental_rerun()
+explore_top_questions()
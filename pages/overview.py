@@ -2,14 +2,17 @@ import streamlit as st
 import pandas as pd
 import plotly.express as px
 import plotly.graph_objects as go
-from utils.data_loader import load_data
-import itertools
-import ast
+from utils import analytics
+from utils.data_loader import get_dataset
+from utils.instrumentation import span
+from utils.perf_panel import cached_chart, section
+from utils.question_card import render_question
 
-df = load_data()
+dataset = get_dataset()
+stats = analytics.kpis(dataset)
 
-earliest_date = df['Asked Date'].min().strftime('%Y-%m-%d')
-latest_date = df['Asked Date'].max().strftime('%Y-%m-%d')
+earliest_date = stats['first_asked'].strftime('%Y-%m-%d')
+latest_date = stats['last_asked'].strftime('%Y-%m-%d')
 st.title("DAX Analytics Dashboard", anchor=False)
 
 st.divider()
@@ -44,22 +47,17 @@ st.markdown("---")
 
 st.subheader("📊 Data Overview")
 
-flattened_list = list(itertools.chain(*df['DAX Functions in Question']))
+with span("Data Overview"):
+    st.write("")
 
-unique_functions = set(flattened_list)
+    total_questions = format(stats['questions'], ',')
+    total_functions_used = stats['functions']
+    total_views = format(stats['views'], ',')
+    total_answers = format(stats['answers'], ',')
+    total_votes = f"{stats['votes']:,}"
+    unique_answer_providers = stats['contributors']
 
-count_unique_functions = len(unique_functions)
-
-st.write("")
-
-total_questions = format(len(df), ',')
-total_functions_used = count_unique_functions
-total_views = format(int(df['Views'].sum()), ',')
-total_answers = format(df['Number of Answers'].sum(), ',')
-total_votes = f"{df['Votes'].sum():,}"
-unique_answer_providers = df['Highest Score Answer Author'].nunique()
-
-st.markdown("""
+    st.markdown("""
 <style>
     .metric-container {
         background-color: #f0f2f6;
@@ -101,11 +99,11 @@ st.markdown("""
 </style>
 """, unsafe_allow_html=True)
 
-st.markdown('<div class="metric-container">', unsafe_allow_html=True)
-col1, col2, col3 = st.columns(3)
+    st.markdown('<div class="metric-container">', unsafe_allow_html=True)
+    col1, col2, col3 = st.columns(3)
 
-with col1:
-    st.markdown("""
+    with col1:
+        st.markdown("""
     <div class="metric">
         <div class="metric-icon">📊</div>
         <div class="metric-title">Dataset Overview</div>
@@ -114,8 +112,8 @@ with col1:
     </div>
     """.format(total_questions), unsafe_allow_html=True)
 
-with col2:
-    st.markdown("""
+    with col2:
+        st.markdown("""
     <div class="metric">
         <div class="metric-icon">🛠️</div>
         <div class="metric-title">Function Utilization</div>
@@ -124,8 +122,8 @@ with col2:
     </div>
     """.format(total_functions_used), unsafe_allow_html=True)
 
-with col3:
-    st.markdown("""
+    with col3:
+        st.markdown("""
     <div class="metric">
         <div class="metric-icon">📈</div>
         <div class="metric-title">Engagement Metrics</div>
@@ -134,13 +132,13 @@ with col3:
     </div>
     """.format(total_views), unsafe_allow_html=True)
 
-st.markdown('</div>', unsafe_allow_html=True)
+    st.markdown('</div>', unsafe_allow_html=True)
 
-st.markdown('<div class="metric-container">', unsafe_allow_html=True)
-col1, col2, col3 = st.columns(3)
+    st.markdown('<div class="metric-container">', unsafe_allow_html=True)
+    col1, col2, col3 = st.columns(3)
 
-with col1:
-    st.markdown("""
+    with col1:
+        st.markdown("""
     <div class="metric">
         <div class="metric-icon">📝</div>
         <div class="metric-title">Total Responses</div>
@@ -149,8 +147,8 @@ with col1:
     </div>
     """.format(total_answers), unsafe_allow_html=True)
 
-with col2:
-    st.markdown("""
+    with col2:
+        st.markdown("""
     <div class="metric">
         <div class="metric-icon">👍</div>
         <div class="metric-title">Community Engagement</div>
@@ -159,8 +157,8 @@ with col2:
     </div>
     """.format(total_votes), unsafe_allow_html=True)
 
-with col3:
-    st.markdown("""
+    with col3:
+        st.markdown("""
     <div class="metric">
         <div class="metric-icon">👥</div>
         <div class="metric-title">Contributor Base</div>
@@ -169,50 +167,15 @@ with col3:
     </div>
     """.format(unique_answer_providers), unsafe_allow_html=True)
 
-st.markdown('</div>', unsafe_allow_html=True)
+    st.markdown('</div>', unsafe_allow_html=True)
 
 st.write("")
 
-def safe_eval(x):
-    try:
-        return ast.literal_eval(x)
-    except ValueError:
-        return []
-
-df['DAX Functions in Question'] = df['DAX Functions in Question'].apply(safe_eval)
-
-df_exploded = df['DAX Functions in Question'].explode()
-
-df_exploded = df_exploded[df_exploded.notna()]
+function_counts = analytics.counts(dataset, 'function').rename_axis('DAX Function').reset_index(name='Counts')
 
-function_counts = df_exploded.value_counts().reset_index(name='Counts')
-function_counts.columns = ['DAX Function', 'Counts']
-function_counts = function_counts.sort_values(by='Counts', ascending=False)
+category_counts = analytics.counts(dataset, 'category').rename_axis('Category').reset_index(name='Counts')
 
-def safe_eval(x):
-    try:
-        return ast.literal_eval(x)
-    except ValueError:
-        return []
-
-df['Categories in Question'] = df['Categories in Question'].apply(safe_eval)
-
-df_exploded_categories = df['Categories in Question'].explode()
-
-df_exploded_categories = df_exploded_categories[df_exploded_categories.notna()]
-
-category_counts = df_exploded_categories.value_counts().reset_index(name='Counts')
-category_counts.columns = ['Category', 'Counts']
-category_counts = category_counts.sort_values(by='Counts', ascending=False)
-
-@st.cache_data
-def load_visual_data():
-    df = pd.read_csv('data/data.csv')
-    return df
-
-df = load_visual_data()
-
-with st.container(border=True):
+with st.container(border=True), span("Toughest Puzzles"):
     st.subheader("🧩 DAX's Toughest Puzzles")
     
     st.markdown("""
@@ -229,138 +192,142 @@ with st.container(border=True):
     with col1:
         with st.container():
             st.write("#### Most Challenging DAX Functions")
-            top_dax_functions = function_counts.head(10)
-            fig_dax_functions = px.bar(top_dax_functions, x='Counts', y='DAX Function', orientation='h',
-                                    text_auto=True,
-                                    color_discrete_sequence=color_palette)
-            fig_dax_functions.update_layout(
-                yaxis={'categoryorder':'total ascending'},
-                xaxis_title="Frequency",
-                yaxis_title="DAX Function",
-                plot_bgcolor='rgba(0,0,0,0)',
-                hoverlabel=dict(bgcolor="white", font_size=12)
-            )
-            st.plotly_chart(fig_dax_functions, use_container_width=True)
+
+            def functions_chart():
+                top_dax_functions = function_counts.head(10)
+                fig_dax_functions = px.bar(top_dax_functions, x='Counts', y='DAX Function', orientation='h',
+                                        text_auto=True,
+                                        color_discrete_sequence=color_palette)
+                fig_dax_functions.update_layout(
+                    yaxis={'categoryorder':'total ascending'},
+                    xaxis_title="Frequency",
+                    yaxis_title="DAX Function",
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    hoverlabel=dict(bgcolor="white", font_size=12)
+                )
+                return fig_dax_functions
+
+            cached_chart(dataset, "Most Challenging DAX Functions", functions_chart, use_container_width=True)
 
     with col2:
         with st.container():
             st.write("#### Frequently Discussed DAX Categories")
-            top_categories = category_counts.head(10)
-            fig_categories = px.bar(top_categories, x='Counts', y='Category', orientation='h',
-                                    text_auto=True,
-                                    color_discrete_sequence=color_palette)
-            fig_categories.update_layout(
-                yaxis={'categoryorder':'total ascending'},
-                xaxis_title="Frequency",
-                yaxis_title="Category",
-                plot_bgcolor='rgba(0,0,0,0)',
-                hoverlabel=dict(bgcolor="white", font_size=12)
-            )
-            st.plotly_chart(fig_categories, use_container_width=True)
+
+            def categories_chart():
+                top_categories = category_counts.head(10)
+                fig_categories = px.bar(top_categories, x='Counts', y='Category', orientation='h',
+                                        text_auto=True,
+                                        color_discrete_sequence=color_palette)
+                fig_categories.update_layout(
+                    yaxis={'categoryorder':'total ascending'},
+                    xaxis_title="Frequency",
+                    yaxis_title="Category",
+                    plot_bgcolor='rgba(0,0,0,0)',
+                    hoverlabel=dict(bgcolor="white", font_size=12)
+                )
+                return fig_categories
+
+            cached_chart(dataset, "Frequently Discussed DAX Categories", categories_chart, use_container_width=True)
 
     col1, col2 = st.columns(2)
 
     with col1:
-        df['difficulty_level'] = df['difficulty_level'].replace({'': pd.NA, 'NA': pd.NA, 'none': pd.NA}).dropna()
-        difficulty_counts = df['difficulty_level'].value_counts().reset_index()
-        difficulty_counts.columns = ['Difficulty Level', 'Counts']
+        difficulty_counts = analytics.counts(dataset, 'difficulty').rename_axis('Difficulty Level').reset_index(name='Counts')
 
         with st.container():
             st.write("#### Complexity Distribution of DAX Questions")
             chart_container = st.container()
             with chart_container:
-                fig_difficulty = px.pie(difficulty_counts, names='Difficulty Level', values='Counts', 
-                                        color_discrete_sequence=color_palette)
-                fig_difficulty.update_traces(textposition='inside', textinfo='percent+label')
-                fig_difficulty.update_layout(
-                    legend=dict(orientation="h", yanchor="bottom", y=-0.1, xanchor="center", x=0.5),
-                    margin=dict(l=20, r=20, t=40, b=20),
-                    height=350
-                )
-                st.plotly_chart(fig_difficulty, use_container_width=True)
+                def difficulty_chart():
+                    fig_difficulty = px.pie(difficulty_counts, names='Difficulty Level', values='Counts', 
+                                            color_discrete_sequence=color_palette)
+                    fig_difficulty.update_traces(textposition='inside', textinfo='percent+label')
+                    fig_difficulty.update_layout(
+                        legend=dict(orientation="h", yanchor="bottom", y=-0.1, xanchor="center", x=0.5),
+                        margin=dict(l=20, r=20, t=40, b=20),
+                        height=350
+                    )
+                    return fig_difficulty
+
+                cached_chart(dataset, "Complexity Distribution", difficulty_chart, use_container_width=True)
 
     with col2:
-        df['concepts'] = df['concepts'].apply(lambda x: safe_eval(x) if isinstance(x, str) else x)
-        df_exploded_concepts = df['concepts'].explode()
-        df_exploded_concepts = df_exploded_concepts[df_exploded_concepts.notna()]
-        concept_counts = df_exploded_concepts.value_counts().reset_index(name='Counts')
-        concept_counts.columns = ['Concept', 'Counts']
-        concept_counts = concept_counts.sort_values(by='Counts', ascending=False)
+        concept_counts = analytics.counts(dataset, 'concept').rename_axis('Concept').reset_index(name='Counts')
 
         with st.container():
             st.write("#### Most Challenging DAX Concepts")
             chart_container = st.container()
             with chart_container:
-                fig_concepts = px.bar(concept_counts.head(10), x='Counts', y='Concept', orientation='h',
-                                    text_auto=True,
-                                    color_discrete_sequence=color_palette)
-                fig_concepts.update_layout(
-                    yaxis={'categoryorder':'total ascending'},
-                    xaxis_title="Frequency",
-                    yaxis_title="Concept",
-                    plot_bgcolor='rgba(0,0,0,0)',
-                    hoverlabel=dict(bgcolor="white", font_size=12),
-                    height=350
-                )
-                st.plotly_chart(fig_concepts, use_container_width=True)
+                def concepts_chart():
+                    fig_concepts = px.bar(concept_counts.head(10), x='Counts', y='Concept', orientation='h',
+                                        text_auto=True,
+                                        color_discrete_sequence=color_palette)
+                    fig_concepts.update_layout(
+                        yaxis={'categoryorder':'total ascending'},
+                        xaxis_title="Frequency",
+                        yaxis_title="Concept",
+                        plot_bgcolor='rgba(0,0,0,0)',
+                        hoverlabel=dict(bgcolor="white", font_size=12),
+                        height=350
+                    )
+                    return fig_concepts
+
+                cached_chart(dataset, "Most Challenging DAX Concepts", concepts_chart, use_container_width=True)
 
 st.write("")
 
-df = load_data()
-
-df['Asked Date'] = pd.to_datetime(df['Asked Date'])
-df['Highest Score Answer Date'] = pd.to_datetime(df['Highest Score Answer Date'])
-
-views_per_month = df.groupby(df['Asked Date'].dt.to_period("M"))['Views'].sum()
-questions_per_month = df.groupby(df['Asked Date'].dt.to_period("M")).size()
+views_per_month = analytics.timeseries(dataset, 'views', grain='month')
+questions_per_month = analytics.timeseries(dataset, 'questions', grain='month')
 
-with st.container(border=True):
+with st.container(border=True), span("Question and View Trends"):
     st.subheader("DAX Question and View Trends Over Time")
     
-    fig = go.Figure()
-
-    fig.add_trace(go.Scatter(x=views_per_month.index.astype(str), y=views_per_month.values,
-                            mode='lines', name='Total Views',
-                            line=dict(color='#1f77b4', width=2)))
-
-    fig.add_trace(go.Scatter(x=questions_per_month.index.astype(str), y=questions_per_month.values,
-                            mode='lines', name='Number of Questions',
-                            line=dict(color='#ff7f0e', width=2), yaxis="y2"))
-
-    fig.update_layout(
-        xaxis_title='Date',
-        yaxis=dict(
-            title='Total Views',
-            titlefont=dict(color='#1f77b4'),
-            tickfont=dict(color='#1f77b4'),
-            showgrid=False
-        ),
-        yaxis2=dict(
-            title='Number of Questions',
-            titlefont=dict(color='#ff7f0e'),
-            tickfont=dict(color='#ff7f0e'),
-            overlaying='y',
-            side='right'),
-        template="plotly_white",
-        xaxis=dict(showgrid=False),
-        legend=dict(
-            orientation='h',
-            yanchor='bottom',
-            y=1.02,
-            xanchor='center',
-            x=0.5
+    def trends_chart():
+        fig = go.Figure()
+
+        fig.add_trace(go.Scatter(x=views_per_month.index.strftime('%Y-%m'), y=views_per_month.values,
+                                mode='lines', name='Total Views',
+                                line=dict(color='#1f77b4', width=2)))
+
+        fig.add_trace(go.Scatter(x=questions_per_month.index.strftime('%Y-%m'), y=questions_per_month.values,
+                                mode='lines', name='Number of Questions',
+                                line=dict(color='#ff7f0e', width=2), yaxis="y2"))
+
+        fig.update_layout(
+            xaxis_title='Date',
+            yaxis=dict(
+                title='Total Views',
+                titlefont=dict(color='#1f77b4'),
+                tickfont=dict(color='#1f77b4'),
+                showgrid=False
+            ),
+            yaxis2=dict(
+                title='Number of Questions',
+                titlefont=dict(color='#ff7f0e'),
+                tickfont=dict(color='#ff7f0e'),
+                overlaying='y',
+                side='right'),
+            template="plotly_white",
+            xaxis=dict(showgrid=False),
+            legend=dict(
+                orientation='h',
+                yanchor='bottom',
+                y=1.02,
+                xanchor='center',
+                x=0.5
+            )
         )
-    )
 
-    fig.add_vline(x='2015-07', line_width=1, line_dash="dash", line_color="#2ca02c")
-    fig.add_annotation(x='2015-07', y=views_per_month.max(),
-                    text="Power BI Launch", showarrow=True, arrowhead=1, ax=-50, ay=-40, arrowsize=1, arrowcolor='#2ca02c')
+        fig.add_vline(x='2015-07', line_width=1, line_dash="dash", line_color="#2ca02c")
+        fig.add_annotation(x='2015-07', y=views_per_month.max(),
+                        text="Power BI Launch", showarrow=True, arrowhead=1, ax=-50, ay=-40, arrowsize=1, arrowcolor='#2ca02c')
 
-    fig.add_vline(x='2022-11', line_width=1, line_dash="dash", line_color="#d62728")
-    fig.add_annotation(x='2022-11', y=views_per_month.max(),
-                    text="ChatGPT Release", showarrow=True, arrowhead=1, ax=50, ay=-40, arrowsize=1, arrowcolor='#d62728')
+        fig.add_vline(x='2022-11', line_width=1, line_dash="dash", line_color="#d62728")
+        fig.add_annotation(x='2022-11', y=views_per_month.max(),
+                        text="ChatGPT Release", showarrow=True, arrowhead=1, ax=50, ay=-40, arrowsize=1, arrowcolor='#d62728')
+        return fig
 
-    st.plotly_chart(fig, use_container_width=True)
+    cached_chart(dataset, "Question and View Trends", trends_chart, use_container_width=True)
 
     st.info("""
         Note: DAX questions appear before Power BI's launch because DAX was introduced in 2009 
@@ -371,7 +338,7 @@ with st.container(border=True):
 
 
 st.write("")
-with st.container(border=True):
+with st.container(border=True), span("Industries"):
     st.subheader("🏭 DAX Usage Across Industries")
     
     st.markdown("""
@@ -379,41 +346,27 @@ with st.container(border=True):
     It provides insights into which sectors are most actively utilizing DAX for data analysis and reporting.
     """)
 
-    # Function to safely convert string representations of lists to actual lists
-    def safe_eval(x):
-        try:
-            return ast.literal_eval(x)
-        except ValueError:
-            return []  # Return an empty list in case of error
-
-    # Apply the conversion function to the 'Industries' column
-    df['industries'] = df['industries'].apply(safe_eval)
-
-    # Explode the 'Industries' column
-    df_exploded_industries = df['industries'].explode()
-
-    # Remove 'None' and empty entries
-    df_exploded_industries = df_exploded_industries[df_exploded_industries.notna()]
-
-    # Count the occurrences of each industry
-    industry_counts = df_exploded_industries.value_counts().reset_index(name='Counts')
-    industry_counts.columns = ['Industry', 'Counts']
+    # Count the questions tagged with each industry
+    industry_counts = analytics.counts(dataset, 'industry').rename_axis('Industry').reset_index(name='Counts')
 
     # Plot the industry distribution using a treemap
-    fig_industries = px.treemap(
-        industry_counts, 
-        path=[px.Constant("Industries"), 'Industry'], 
-        values='Counts',
-        title="Industry Distribution of DAX Queries",
-        color='Counts',
-        color_continuous_scale='Viridis'
-    )
-    fig_industries.update_traces(textinfo='label+value+percent parent')
-    fig_industries.update_layout(
-        margin=dict(t=30, l=10, r=10, b=10),
-        coloraxis_colorbar=dict(title="Query Count")
-    )
-    st.plotly_chart(fig_industries, use_container_width=True)
+    def industries_chart():
+        fig_industries = px.treemap(
+            industry_counts, 
+            path=[px.Constant("Industries"), 'Industry'], 
+            values='Counts',
+            title="Industry Distribution of DAX Queries",
+            color='Counts',
+            color_continuous_scale='Viridis'
+        )
+        fig_industries.update_traces(textinfo='label+value+percent parent')
+        fig_industries.update_layout(
+            margin=dict(t=30, l=10, r=10, b=10),
+            coloraxis_colorbar=dict(title="Query Count")
+        )
+        return fig_industries
+
+    cached_chart(dataset, "Industry Distribution", industries_chart, use_container_width=True)
 
     st.caption("The size and color of each box represent the number of DAX queries associated with that industry.")
 
@@ -425,7 +378,7 @@ st.write("")
 
 st.write("")
 
-with st.container(border=True):
+with st.container(border=True), span("Key Insights"):
     st.subheader("📊 Key Insights and Analytics")
     st.markdown("---")
     
@@ -433,25 +386,18 @@ with st.container(border=True):
     
     with col1:
         st.metric("🔥 Most Upvoted Answer", 
-                  f"{df['Votes'].max()} votes", 
-                  f"{df['Votes'].max() - df['Votes'].mean():.0f} above average")
+                  f"{stats['votes_max']} votes", 
+                  f"{stats['votes_max'] - stats['votes_mean']:.0f} above average")
         
-        average_views = df['Views'].mean()
-        above_average_views = df['Views'].max() - df['Views'].mean()
         st.metric("👁️ Most Viewed Question", 
-                  f"{format(int(df['Views'].max()),',')} views", 
-                  f"Average per Question: {format(int(average_views),',')} views")
+                  f"{format(stats['views_max'],',')} views", 
+                  f"Average per Question: {format(int(stats['views_mean']),',')} views")
     
     with col2:
-        filtered_df = df[df['Highest Score Answer Author'] != 'Anonymous']
-
-        top_answerer = filtered_df['Highest Score Answer Author'].value_counts().index[0]
-        top_answer_count = filtered_df['Highest Score Answer Author'].value_counts().max()
-
-        st.metric("🏆 Top Contributor", top_answerer, f"{top_answer_count} high-quality answers")
+        st.metric("🏆 Top Contributor", stats['top_contributor'], f"{stats['top_contributor_answers']} high-quality answers")
         
         st.metric("🧠 Expert Network Size", 
-                  f"{filtered_df['Highest Score Answer Author'].nunique()} experts",
+                  f"{stats['experts']} experts",
                   "Unique answer providers")
 
     st.markdown("---")
@@ -463,100 +409,72 @@ with st.container(border=True):
             with st.container(border=True):
                 st.markdown("📊 **Answer Engagement Metrics**")
                 st.markdown(f"""
-                - Minimum Votes: {df['Votes'].min()}
-                - Average Votes: {df['Votes'].mean():.1f}
-                - Maximum Votes: {df['Votes'].max()}
+                - Minimum Votes: {stats['votes_min']}
+                - Average Votes: {stats['votes_mean']:.1f}
+                - Maximum Votes: {stats['votes_max']}
                 """)
 
             with st.container(border=True):
                 st.markdown("🎯 **Question Response Analysis**")
                 st.markdown(f"""
-                - Average Answers per Question: {df['Number of Answers'].mean():.1f}
-                - Most Discussed Question: {df['Number of Answers'].max()} responses
-                - Modal Answer Count: {df['Number of Answers'].mode().values[0]}
+                - Average Answers per Question: {stats['answers_mean']:.1f}
+                - Most Discussed Question: {stats['answers_max']} responses
+                - Modal Answer Count: {stats['answers_mode']}
                 """)
 
         with col2:
             with st.container(border=True):
                 st.markdown("💬 **Community Engagement Overview**")
                 st.markdown(f"""
-                - Total Answers: {df['Number of Answers'].sum():,}
-                - Total Views: {format(int(df['Views'].sum()), ',')}
-                - Average Views per Question: {format(int(df['Views'].mean()), ',')}
+                - Total Answers: {stats['answers']:,}
+                - Total Views: {format(stats['views'], ',')}
+                - Average Views per Question: {format(int(stats['views_mean']), ',')}
                 """)
 
             with st.container(border=True):
                 st.markdown("🏆 **Top Contributor Insights**")
-                filtered_df_for_top_author = df[df['Highest Score Answer Author'] != 'Anonymous']
-                top_author = filtered_df_for_top_author['Highest Score Answer Author'].value_counts().index[0]
-                top_author_count = filtered_df_for_top_author['Highest Score Answer Author'].value_counts().max()
                 st.markdown(f"""
-                - Leading Contributor: {top_author}
-                - Contributions by Leading Contributor: {top_author_count}
-                - Unique Contributors: {filtered_df_for_top_author['Highest Score Answer Author'].nunique()}
+                - Leading Contributor: {stats['top_contributor']}
+                - Contributions by Leading Contributor: {stats['top_contributor_answers']}
+                - Unique Contributors: {stats['experts']}
                 """)
         
-        fig_histogram = px.histogram(df, x='Number of Answers', nbins=10, title='Distribution of Answers per Question', text_auto=True)
-
-        fig_histogram.update_layout(
-            xaxis_title='Number of Answers',
-            yaxis_title='Frequency',
-            template="plotly_white",
-            bargap=0.2,
-            height=300
-        )
+        def answers_histogram():
+            fig_histogram = px.histogram(dataset.frame(['Number of Answers']), x='Number of Answers', nbins=10, title='Distribution of Answers per Question', text_auto=True)
+
+            fig_histogram.update_layout(
+                xaxis_title='Number of Answers',
+                yaxis_title='Frequency',
+                template="plotly_white",
+                bargap=0.2,
+                height=300
+            )
+            return fig_histogram
 
-        st.plotly_chart(fig_histogram, use_container_width=True)
+        cached_chart(dataset, "Distribution of Answers per Question", answers_histogram, use_container_width=True)
 
     st.info("💡 **Professional Tip:** To enhance your DAX proficiency, focus on mastering concepts associated with highly-viewed questions, as these often represent common challenges in the field.")
 
 st.write("")
 
-df['Asked Date'] = pd.to_datetime(df['Asked Date'])
-
-with st.container(border=True):
-    st.subheader("👀 Most Viewed Questions")
+@section("Most Viewed Questions")
+def most_viewed_questions():
+    with st.container(border=True):
+        st.subheader("👀 Most Viewed Questions")
     
-    num_questions = st.slider("Select number of top viewed questions to display", min_value=1, max_value=20, value=3)
+        num_questions = st.slider("Select number of top viewed questions to display", min_value=1, max_value=20, value=3)
     
-    if st.button("🔍 Show Me", type="primary"):
-        top_views = df.nlargest(num_questions, 'Views')[['context', 'dax_code_provided', 'correct_answer', 'concepts', 'Asked Date', 'Views', 'Number of Answers', 'URL']]
-
-        for idx, (index, row) in enumerate(top_views.iterrows()):
-            st.markdown(f"### Question {idx + 1}:")
-
-            col1, col2, col3, col4 = st.columns([1.5, 1, 0.7, 2])
-
-            with col1:
-                with st.container(border=True):
-                    st.markdown(f"**Asked Date:** {row['Asked Date'].strftime('%Y-%m-%d')}")
-            
-            with col2:
-                with st.container(border=True):
-                    st.markdown(f"**Views:** {format(int(row['Views']), ',')}")
-
-            with col3:
-                with st.container(border=True):
-                    st.markdown(f"**Answers:** {row['Number of Answers']}")
-
-            with col4:
-                with st.container(border=True):
-                    st.markdown(f"**Concepts**: {row['concepts']}")
-
-            st.write(row['context'])
-            
-            if row['dax_code_provided']:
-                st.code(row['dax_code_provided'], language='sql')
-            
-            if row['correct_answer']:
-                st.markdown(f"#### Correct Answer:")
-                st.code(row['correct_answer'], language='sql')
-            
-            st.markdown(f"[View original post]({row['URL']})", unsafe_allow_html=True)
-            st.markdown("---")
-
-    if st.button("🔄 Okay, I'm done", type="primary"):
-        st.rerun()
+        if st.button("🔍 Show Me", type="primary"):
+            top_views = analytics.top_questions(dataset, num_questions)
+
+            for idx, (index, row) in enumerate(top_views.iterrows()):
+                render_question(row, f"Question {idx + 1}:")
+
+        # Clicking reruns the section, which clears the questions shown above.
+        st.button("🔄 Okay, I'm done", type="primary")
+
+
+most_viewed_questions()
 
 st.divider()
 st.markdown("👨‍💻 Created by [Mandla Sibanda](https://www.linkedin.com/in/mandlasibanda/)")
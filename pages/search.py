@@ -0,0 +1,59 @@
+import streamlit as st
+
+from utils import analytics
+from utils.data_loader import get_dataset
+from utils.instrumentation import span
+from utils.perf_panel import section
+from utils.question_card import render_question
+
+dataset = get_dataset()
+
+st.title("Search DAX Questions", anchor=False)
+st.write(
+    "Search the question text, the DAX code and the accepted answers. "
+    "DAX function names such as `CALCULATE` or `PERCENTILE.INC` match as whole words, "
+    "and results are ranked by relevance (BM25)."
+)
+
+st.divider()
+
+@section("Search Results")
+def search_results():
+    with st.container(border=True):
+        query = st.text_input("Search questions", placeholder="e.g. CALCULATE ALLEXCEPT running total", key="search_query")
+
+        col1, col2, col3 = st.columns([2, 2, 1])
+        with col1:
+            category = st.selectbox(
+                "Category",
+                options=[None, *analytics.counts(dataset, 'category').index],
+                format_func=lambda name: name or "Any category",
+                key="search_category"
+            )
+        with col2:
+            function = st.selectbox(
+                "DAX function",
+                options=[None, *sorted(analytics.counts(dataset, 'function').index)],
+                format_func=lambda name: name or "Any function",
+                key="search_function"
+            )
+        with col3:
+            num_results = st.number_input("Results", min_value=1, max_value=50, value=10, key="search_results")
+
+    if not query.strip():
+        st.info("💡 Type a few words or DAX function names to find matching questions.")
+        return
+
+    with span("search"):
+        hits = analytics.search_questions(dataset, query, num_results, function, category)
+
+    if hits.empty:
+        st.write(f"No questions match **{query}** with the selected filters.")
+        return
+
+    st.caption(f"Top {len(hits)} matches for **{query}**")
+    for idx, (index, row) in enumerate(hits.iterrows()):
+        render_question(row, f"{idx + 1}. Score {row['score']:.2f}")
+
+
+search_results()
@@ -0,0 +1,39 @@
+import pandas as pd
+
+from benchmarks.synthetic import generate
+from utils import analytics
+from utils.dataset import Dataset
+from utils.ingest import append, ingest
+
+
+def _dumps(tmp_path):
+    raw = pd.read_parquet(generate(2000, tmp_path / 'raw.parquet')).sort_values('Asked Date')
+    parts = {'history': raw.iloc[:-200], 'first': raw.iloc[-200:-100], 'second': raw.iloc[-100:]}
+    for name, part in parts.items():
+        part.to_parquet(tmp_path / f'{name}.parquet')
+    return raw
+
+
+def test_dataset_loaded_before_append_still_reads(tmp_path):
+    _dumps(tmp_path)
+    output = tmp_path / 'dataset'
+    ingest(tmp_path / 'history.parquet', output, jobs=1)
+    stale = Dataset.read(output)
+
+    append(tmp_path / 'first.parquet', output, jobs=1)
+
+    top = analytics.top_questions(stale, 3)
+    assert len(top) == 3 and top['context'].notna().all()
+    assert len(stale.cube().table)
+
+
+def test_append_keeps_only_two_generations(tmp_path):
+    raw = _dumps(tmp_path)
+    output = tmp_path / 'dataset'
+    ingest(tmp_path / 'history.parquet', output, jobs=1)
+    append(tmp_path / 'first.parquet', output, jobs=1)
+    append(tmp_path / 'second.parquet', output, jobs=1)
+
+    assert len(Dataset.read(output)) == len(raw)
+    months = [path.name.rsplit('-', 1)[0] for path in (output / 'questions').glob('*.parquet')]
+    assert max(pd.Series(months).value_counts()) <= 2
@@ -0,0 +1,92 @@
+"""Streamlit-free analytics over a `Dataset`.
+
+Every function takes the dataset plus plain parameters and returns plain
+values or pandas objects, so the numbers behind the pages can also be
+computed in batch (`python -m utils.batch`), in a notebook or in a worker.
+Heavy lifting is delegated to the dataset's memoized indexes.
+"""
+import numpy as np
+import pandas as pd
+
+from utils.schema import DIMENSIONS
+
+QUESTION_COLUMNS = ['context', 'dax_code_provided', 'correct_answer', 'concepts', 'Asked Date', 'Views', 'Number of Answers', 'URL']
+
+
+def _scalar(value):
+    if pd.isna(value):
+        return None
+    return value.item() if hasattr(value, 'item') else value
+
+
+def kpis(dataset):
+    """Headline numbers for the overview cards and insights, as a flat dict.
+
+    Read from the dataset's memoized `KpiSummary`, so the cost does not grow
+    with the number of questions.
+    """
+    stats = {'functions': len(dataset.cube().totals('function')), **dataset.kpi_summary().stats}
+    return {key: _scalar(value) for key, value in stats.items()}
+
+
+def counts(dataset, dimension, measure='questions'):
+    """Questions (or another cube measure) per function, category, concept, industry or difficulty."""
+    return dataset.cube().totals(dimension, measure)
+
+
+def timeseries(dataset, measure='questions', grain='month', dimension='all', members=None):
+    return dataset.cube().timeseries(measure, grain, dimension, members)
+
+
+def hourly_activity(dataset, tz):
+    return dataset.hourly().by_hour(tz)
+
+
+def weekly_heatmap(dataset, tz, kind='asked'):
+    return dataset.hourly().heatmap(tz, kind)
+
+
+def category_usage(dataset, category):
+    return dataset.category_usage().table(category)
+
+
+def function_usage(dataset):
+    """Questions per function, for functions that appear at least once."""
+    usage = dataset.cooccurrence().usage()
+    return usage[usage > 0]
+
+
+def hierarchy(dataset, root=None, depth=None):
+    """Concept -> category -> function rollup rows (see `utils.hierarchy`), optionally only `root`'s subtree."""
+    return dataset.hierarchy().subtree(root, depth)
+
+
+def top_functions(dataset, n):
+    return dataset.cooccurrence().top(n)
+
+
+def cooccurrence_edges(dataset, functions, metric='count', min_weight=None):
+    return dataset.cooccurrence().edges(functions, metric=metric, min_weight=min_weight)
+
+
+def top_questions(dataset, k, function=None, columns=QUESTION_COLUMNS):
+    """The `k` most viewed questions, optionally only those using `function`."""
+    if function is None:
+        positions = dataset.postings().top_overall(k)
+    else:
+        positions = dataset.postings('DAX Functions in Question').top(function, k)
+    return dataset.rows(positions, columns)
+
+
+def search_questions(dataset, query, k=10, function=None, category=None, columns=QUESTION_COLUMNS):
+    """The `k` questions that best match `query` (BM25), best first, with a 'score' column.
+
+    `function` and `category` keep only questions that list them.
+    """
+    rows = None
+    for dimension, name in [('function', function), ('category', category)]:
+        if name:
+            matching = dataset.incidence(DIMENSIONS[dimension]).rows_with(name)
+            rows = matching if rows is None else np.intersect1d(rows, matching)
+    positions, scores = dataset.search(query, k, rows)
+    return dataset.rows(positions, columns).assign(score=scores)
@@ -0,0 +1,73 @@
+"""Execution backends for the grouped aggregations behind the cube.
+
+Building and rolling up the cube groups (period, member) rows and takes row
+counts, sums and distinct-author counts. pandas does this on a single core;
+``DAX_BACKEND=arrow`` (pyarrow.compute) or ``DAX_BACKEND=polars`` runs the
+same aggregations multi-threaded. Every backend returns the same frame: one
+row per key combination, sorted by the keys with missing keys last.
+"""
+import os
+
+import pandas as pd
+import pyarrow as pa
+
+BACKENDS = ['pandas', 'arrow', 'polars']
+BACKEND = os.environ.get('DAX_BACKEND', 'pandas')
+
+
+def _pandas(frame, keys, size, sums, nunique):
+    grouped = frame.groupby(keys, dropna=False, sort=True)
+    parts = []
+    if size:
+        parts.append(grouped.size().rename(size))
+    if sums:
+        parts.append(grouped[sums].sum())
+    for name, column in nunique.items():
+        parts.append(grouped[column].nunique().rename(name))
+    return pd.concat(parts, axis=1).reset_index()
+
+
+def _arrow(frame, keys, size, sums, nunique):
+    columns = list(dict.fromkeys([*keys, *sums, *nunique.values()]))
+    table = pa.Table.from_pandas(frame[columns], preserve_index=False)
+    aggregations = [([], 'count_all')] if size else []
+    aggregations += [(column, 'sum') for column in sums]
+    aggregations += [(column, 'count_distinct') for column in nunique.values()]
+    result = table.group_by(keys).aggregate(aggregations).to_pandas()
+    names = {'count_all': size}
+    names.update({f'{column}_sum': column for column in sums})
+    names.update({f'{column}_count_distinct': name for name, column in nunique.items()})
+    return result.rename(columns=names)
+
+
+def _polars(frame, keys, size, sums, nunique):
+    try:
+        import polars as pl
+    except ImportError as error:
+        raise ImportError('DAX_BACKEND=polars needs the polars package (pip install polars)') from error
+    columns = list(dict.fromkeys([*keys, *sums, *nunique.values()]))
+    expressions = [pl.len().alias(size)] if size else []
+    expressions += [pl.col(column).sum() for column in sums]
+    expressions += [pl.col(column).drop_nulls().n_unique().alias(name) for name, column in nunique.items()]
+    return pl.from_pandas(frame[columns]).lazy().group_by(keys).agg(expressions).collect().to_pandas()
+
+
+ENGINES = {'pandas': _pandas, 'arrow': _arrow, 'polars': _polars}
+
+
+def aggregate(frame, keys, size=None, sums=(), nunique=None, backend=None):
+    """Group ``frame`` by ``keys``, keeping missing keys as their own group.
+
+    ``size`` names an optional row count column, ``sums`` are summed and
+    ``nunique`` maps output names to columns whose distinct non-missing
+    values are counted.
+    """
+    backend = backend or BACKEND
+    if backend not in ENGINES:
+        raise ValueError(f'unknown backend {backend!r}; expected one of {BACKENDS}')
+    sums, nunique = list(sums), dict(nunique or {})
+    result = ENGINES[backend](frame, keys, size, sums, nunique)
+    sizes = [size] if size else []
+    result[[*sizes, *nunique]] = result[[*sizes, *nunique]].astype('int64')
+    result = result.sort_values(keys, na_position='last', kind='stable', ignore_index=True)
+    return result[[*keys, *sizes, *sums, *nunique]]
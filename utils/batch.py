@@ -0,0 +1,148 @@
+"""Compute every dashboard result in batch and write it to a directory.
+
+    python -m utils.batch [--dataset data/dataset] [--output results] [--timezones UTC Europe/London] [--jobs 4]
+
+Runs the `utils.analytics` functions outside Streamlit, so results can be
+precomputed on a big machine (for example nightly, right after ingest) and
+shipped alongside the dataset. Outputs are Parquet tables plus `kpis.json`
+and a `manifest.json` recording the dataset version and per-file timings.
+"""
+import argparse
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+import pandas as pd
+
+from utils import analytics
+from utils.cooccurrence import METRICS
+from utils.cube import GRAINS, MEASURES
+from utils.dataset import Dataset
+from utils.hourly import DAY_ORDER
+from utils.schema import DATASET_PATH, DIMENSIONS
+
+
+def dimension_counts(dataset, dimension):
+    totals = pd.concat({measure: analytics.counts(dataset, dimension, measure) for measure in MEASURES}, axis=1)
+    return totals.rename_axis('member').reset_index()
+
+
+def rollup(dataset, grain, dimension='all'):
+    series = {measure: analytics.timeseries(dataset, measure, grain, dimension) for measure in MEASURES}
+    if dimension == 'all':
+        return pd.concat(series, axis=1).rename_axis('period').reset_index()
+    return pd.concat(
+        {measure: wide.stack() for measure, wide in series.items()}, axis=1
+    ).rename_axis(['period', 'member']).reset_index()
+
+
+def hourly(dataset, tz):
+    by_hour = analytics.hourly_activity(dataset, tz).reset_index()
+    heatmaps = [
+        analytics.weekly_heatmap(dataset, tz, kind).reindex(DAY_ORDER).rename_axis('day').reset_index()
+        .melt(id_vars='day', var_name='hour', value_name='questions').assign(kind=kind)
+        for kind in ('asked', 'answered')
+    ]
+    return by_hour, pd.concat(heatmaps, ignore_index=True)
+
+
+def category_usage(dataset):
+    usage = dataset.category_usage()
+    tables = [
+        usage.table(category).rename_axis('function').reset_index(name='questions').assign(category=category)
+        for category in usage.tables
+    ]
+    return pd.concat(tables, ignore_index=True)[['category', 'function', 'questions']]
+
+
+def cooccurrence(dataset, top):
+    functions = analytics.top_functions(dataset, top)
+    edges = analytics.cooccurrence_edges(dataset, functions, 'count')[['source', 'target', 'count']]
+    for metric in METRICS:
+        if metric != 'count':
+            weighted = analytics.cooccurrence_edges(dataset, functions, metric)
+            edges[metric] = weighted['weight'].to_numpy()
+    return edges
+
+
+def top_questions(dataset, k):
+    columns = ['question_id', *analytics.QUESTION_COLUMNS]
+    parts = [analytics.top_questions(dataset, k, columns=columns).assign(function=None)]
+    for function in dataset.incidence('DAX Functions in Question').vocabulary:
+        parts.append(analytics.top_questions(dataset, k, function, columns=columns).assign(function=function))
+    parts = [part.assign(rank=range(1, len(part) + 1)) for part in parts]
+    return pd.concat(parts, ignore_index=True)
+
+
+def _tz_name(tz):
+    return tz.replace('/', '_')
+
+
+def tasks(dataset, timezones, top, k):
+    """Yield (file name, callable) pairs; every callable returns a frame or a dict."""
+    yield 'kpis.json', lambda: analytics.kpis(dataset)
+    for dimension in DIMENSIONS:
+        yield f'counts/{dimension}.parquet', lambda d=dimension: dimension_counts(dataset, d)
+    for grain in GRAINS:
+        if grain != 'all':
+            yield f'timeseries/{grain}.parquet', lambda g=grain: rollup(dataset, g)
+    for dimension in DIMENSIONS:
+        yield f'timeseries/year_by_{dimension}.parquet', lambda d=dimension: rollup(dataset, 'year', d)
+    for tz in timezones:
+        yield f'hourly/{_tz_name(tz)}.parquet', lambda tz=tz: hourly(dataset, tz)[0]
+        yield f'heatmap/{_tz_name(tz)}.parquet', lambda tz=tz: hourly(dataset, tz)[1]
+    yield 'category_usage.parquet', lambda: category_usage(dataset)
+    yield 'hierarchy.parquet', lambda: analytics.hierarchy(dataset)
+    yield 'cooccurrence.parquet', lambda: cooccurrence(dataset, top)
+    yield 'top_questions.parquet', lambda: top_questions(dataset, k)
+
+
+def write(result, path):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(result, dict):
+        path.write_text(json.dumps(result, indent=2, default=str))
+    else:
+        result.to_parquet(path, index=False, compression='zstd')
+
+
+def run(dataset, output, timezones=('UTC',), top=50, k=10, jobs=1):
+    output = Path(output)
+    # Build the shared indexes once up front; the tasks then only read them.
+    for warm in (dataset.cube, dataset.hourly, dataset.category_usage, dataset.cooccurrence, dataset.postings):
+        warm()
+
+    def compute(name, task):
+        started = time.perf_counter()
+        write(task(), output / name)
+        return name, time.perf_counter() - started
+
+    with ThreadPoolExecutor(max_workers=jobs) as pool:
+        timings = dict(pool.map(lambda item: compute(*item), tasks(dataset, timezones, top, k)))
+
+    manifest = {
+        'dataset_version': dataset.version,
+        'rows': len(dataset),
+        'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+        'files': {name: round(seconds, 4) for name, seconds in sorted(timings.items())},
+    }
+    write(manifest, output / 'manifest.json')
+    return manifest
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Precompute the dashboard analytics to disk.')
+    parser.add_argument('--dataset', default=DATASET_PATH)
+    parser.add_argument('--output', default='results')
+    parser.add_argument('--timezones', nargs='+', default=['UTC'])
+    parser.add_argument('--top', type=int, default=50, help='functions in the co-occurrence table')
+    parser.add_argument('-k', type=int, default=10, help='top questions per function')
+    parser.add_argument('--jobs', type=int, default=4)
+    args = parser.parse_args(argv)
+    manifest = run(Dataset.read(args.dataset), args.output, args.timezones, args.top, args.k, args.jobs)
+    print(json.dumps(manifest, indent=2))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,67 @@
+"""Function -> category mapping from ``data/dax-categories.json``.
+
+The JSON lists functions per category; some functions sit in several
+categories. The mapping is held as a sparse function x category membership
+matrix so one pass over the function counts yields every category's usage
+table, and a category switch in the UI is a dictionary lookup.
+"""
+import json
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from utils.schema import CATEGORIES_PATH
+
+
+class FunctionCategories:
+    def __init__(self, mapping):
+        self.mapping = {category: list(functions) for category, functions in mapping.items()}
+        self.categories = list(mapping)
+        self.functions = np.array(sorted({f for functions in mapping.values() for f in functions}), dtype=object)
+        codes = {name: code for code, name in enumerate(self.functions)}
+        rows = [codes[f] for functions in mapping.values() for f in dict.fromkeys(functions)]
+        cols = [c for c, functions in enumerate(mapping.values()) for _ in dict.fromkeys(functions)]
+        self.membership = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int8), (rows, cols)),
+            shape=(len(self.functions), len(self.categories)),
+        )
+
+    @classmethod
+    def load(cls, path=CATEGORIES_PATH):
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def functions_in(self, category):
+        return list(self.mapping[category])
+
+    def usage(self, function_counts):
+        return CategoryUsage(self, function_counts)
+
+
+@lru_cache(maxsize=4)
+def function_categories(path=CATEGORIES_PATH):
+    """Process-wide, read-only mapping loaded from the categories JSON."""
+    return FunctionCategories.load(path)
+
+
+class CategoryUsage:
+    """Per-category function usage tables, computed once from overall function counts."""
+
+    def __init__(self, categories, function_counts):
+        counts = function_counts.reindex(categories.functions, fill_value=0).to_numpy()
+        # Scale each function's membership row by its count; column c is then
+        # the usage table for category c.
+        usage = sparse.diags(counts, dtype=np.int64) @ categories.membership.tocsc()
+        self.tables = {}
+        for c, category in enumerate(categories.categories):
+            column = usage[:, c].tocoo()
+            table = pd.Series(column.data, index=categories.functions[column.row], name='Counts')
+            self.tables[category] = table[table > 0].sort_values(ascending=False, kind='stable')
+
+        known = function_counts.index.isin(categories.functions)
+        self.unknown = function_counts[~known & (function_counts > 0)].sort_values(ascending=False, kind='stable')
+
+    def table(self, category):
+        return self.tables.get(category, pd.Series(dtype='int64', name='Counts'))
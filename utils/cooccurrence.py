@@ -0,0 +1,106 @@
+"""Function co-occurrence engine for the network view.
+
+The full pair-count matrix is one sparse product over the incidence index and
+is built once per dataset; "edges among these functions" is then a submatrix
+slice, with optional association metrics to thin out weak edges. Pair counts
+are additive, so the matrix can also be summed from per-month pair tables.
+"""
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+METRICS = {
+    'count': 'Co-occurrence count',
+    'lift': 'Lift',
+    'pmi': 'Pointwise mutual information',
+    'jaccard': 'Jaccard similarity',
+}
+
+
+class Cooccurrence:
+    def __init__(self, pairs, vocabulary, questions):
+        self.vocabulary = np.asarray(vocabulary, dtype=object)
+        self.questions = questions
+        self.pairs = pairs.tocsr()
+        self.counts = self.pairs.diagonal().astype(np.int64)
+        self._codes = {name: code for code, name in enumerate(self.vocabulary)}
+
+    @classmethod
+    def from_incidence(cls, incidence):
+        return cls(incidence.cooccurrence(), incidence.vocabulary, incidence.shape[0])
+
+    @classmethod
+    def from_pair_tables(cls, tables, questions):
+        """Sum pair tables (see `monthly_pair_tables`) into one engine."""
+        # The diagonal lists every item, so its sources are the whole vocabulary.
+        vocabulary = np.unique(tables.loc[tables['source'] == tables['target'], 'source'].to_numpy(dtype=str))
+        i = pd.Categorical(tables['source'], categories=vocabulary).codes
+        j = pd.Categorical(tables['target'], categories=vocabulary).codes
+        # Duplicate (i, j) entries from different months are summed by tocsr().
+        upper = sparse.coo_matrix(
+            (tables['count'].to_numpy(dtype=np.int64), (i, j)), shape=(len(vocabulary), len(vocabulary))
+        ).tocsr()
+        matrix = upper + sparse.triu(upper, k=1).T
+        return cls(matrix, vocabulary.astype(object), questions)
+
+
+    def usage(self, names=None):
+        counts = pd.Series(self.counts, index=self.vocabulary)
+        return counts if names is None else counts.reindex(names, fill_value=0)
+
+    def top(self, n):
+        order = np.lexsort((self.vocabulary.astype(str), -self.counts))
+        order = order[self.counts[order] > 0]
+        return self.vocabulary[order[:n]].tolist()
+
+    def weights(self, i, j, count, metric='count'):
+        count = np.asarray(count, dtype=np.float64)
+        if metric == 'count':
+            return count
+        left, right = self.counts[i].astype(np.float64), self.counts[j].astype(np.float64)
+        if metric == 'jaccard':
+            return count / (left + right - count)
+        lift = count * self.questions / (left * right)
+        if metric == 'lift':
+            return lift
+        if metric == 'pmi':
+            return np.log2(lift)
+        raise ValueError(f'unknown co-occurrence metric: {metric!r}')
+
+    def edges(self, names, metric='count', min_weight=None):
+        """Edges among `names` as a frame of source, target, count and weight."""
+        codes = np.sort(np.array([self._codes[n] for n in names if n in self._codes], dtype=np.int64))
+        block = sparse.triu(self.pairs[codes][:, codes], k=1).tocoo()
+        i, j = codes[block.row], codes[block.col]
+        edges = pd.DataFrame({
+            'source': self.vocabulary[i],
+            'target': self.vocabulary[j],
+            'count': block.data.astype(np.int64),
+            'weight': self.weights(i, j, block.data, metric),
+        })
+        if min_weight is not None:
+            edges = edges[edges['weight'] >= min_weight]
+        return edges.sort_values(['source', 'target'], ignore_index=True)
+
+
+def monthly_pair_tables(incidence, months):
+    """Pair counts of each month's questions as month, source, target, count.
+
+    Only the upper triangle is kept (diagonal included, holding item counts),
+    with source <= target in vocabulary order.
+    """
+    matrix = incidence.matrix.astype(np.int64)
+    labels, inverse = np.unique(months, return_inverse=True)
+    order = np.argsort(inverse, kind='stable')
+    bounds = np.concatenate([[0], np.cumsum(np.bincount(inverse, minlength=len(labels)))])
+    parts = []
+    for month, start, stop in zip(labels, bounds[:-1], bounds[1:]):
+        block = matrix[order[start:stop]]
+        upper = sparse.triu(block.T @ block).tocoo()
+        parts.append(pd.DataFrame({
+            'month': month,
+            'source': incidence.vocabulary[upper.row],
+            'target': incidence.vocabulary[upper.col],
+            'count': upper.data.astype(np.int64),
+        }))
+    return pd.concat(parts, ignore_index=True)
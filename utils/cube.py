@@ -0,0 +1,144 @@
+"""Pre-aggregated question cube: time grain x dimension member -> measures.
+
+Month rows are built at ingest time and stored with each month partition;
+year and all-time rows are rolled up from them when the dataset is loaded.
+Charts that are plain rollups (questions per month, views per month, function
+usage per year, industry or difficulty totals) then read a few hundred rows
+instead of grouping every question on each rerun.
+"""
+import numpy as np
+import pandas as pd
+
+from utils.backends import aggregate
+from utils.schema import DIMENSIONS, LIST_COLUMNS
+
+GRAINS = {'month': 'datetime64[M]', 'year': 'datetime64[Y]', 'all': None}
+MEASURES = ['questions', 'views', 'votes', 'answers', 'authors']
+ADDITIVE = ['questions', 'views', 'votes', 'answers']
+
+
+def _base(frame):
+    asked = frame['Asked Date'].dt.tz_convert(None).to_numpy()
+    author = frame['Highest Score Answer Author'].astype('string')
+    return pd.DataFrame({
+        'month': asked.astype(GRAINS['month']).astype('datetime64[ns]'),
+        'year': asked.astype(GRAINS['year']).astype('datetime64[ns]'),
+        'views': frame['Views'].astype('float64').to_numpy(na_value=0.0),
+        'votes': frame['Votes'].astype('float64').to_numpy(na_value=0.0),
+        'answers': frame['Number of Answers'].astype('float64').to_numpy(na_value=0.0),
+        'author': author.mask(author == 'Anonymous').to_numpy(dtype=object, na_value=None),
+    })
+
+
+def _members(dataset, base, dimension):
+    if dimension == 'all':
+        return base.assign(member='')
+    column = DIMENSIONS[dimension]
+    if column in LIST_COLUMNS:
+        rows, codes = dataset.incidence(column).matrix.nonzero()
+        return base.iloc[rows].assign(member=dataset.incidence(column).vocabulary[codes])
+    values = dataset.column(column)
+    keep = values.notna().to_numpy()
+    return base[keep].assign(member=values[keep].astype(str).to_numpy())
+
+
+def _author_codes(authors):
+    # Distinct counts over integer codes are cheaper for every backend than over
+    # strings; NaN keeps missing authors out of the count.
+    codes = pd.factorize(authors)[0].astype('float64')
+    codes[codes < 0] = np.nan
+    return codes
+
+
+def _base_frame(dataset):
+    return _base(dataset.frame(['Asked Date', 'Views', 'Votes', 'Number of Answers', 'Highest Score Answer Author']))
+
+
+def build_cube(dataset, grains=GRAINS):
+    base = _base_frame(dataset)
+    base['author'] = _author_codes(base['author'])
+    parts = []
+    for dimension in ['all', *DIMENSIONS]:
+        rows = _members(dataset, base, dimension)
+        for grain in grains:
+            period = rows[grain] if grain != 'all' else pd.Series(pd.NaT, index=rows.index, dtype='datetime64[ns]')
+            part = aggregate(
+                rows.assign(period=period), ['period', 'member'],
+                size='questions', sums=['views', 'votes', 'answers'], nunique={'authors': 'author'},
+            )
+            parts.append(part.assign(grain=grain, dimension=dimension))
+    cube = pd.concat(parts, ignore_index=True)
+    cube[MEASURES] = cube[MEASURES].astype('int64')
+    return cube[['grain', 'period', 'dimension', 'member', *MEASURES]]
+
+
+def author_pairs(dataset):
+    """Distinct (month, dimension, member, author) rows, so that month partitions
+    can be rolled up into exact distinct-author counts per year and overall."""
+    base = _base_frame(dataset)
+    parts = [
+        _members(dataset, base, dimension)[['month', 'member', 'author']].dropna(subset=['author']).drop_duplicates().assign(dimension=dimension)
+        for dimension in ['all', *DIMENSIONS]
+    ]
+    authors = pd.concat(parts, ignore_index=True).rename(columns={'month': 'period'})
+    return authors[['period', 'dimension', 'member', 'author']]
+
+
+def _coarsen(period, grain):
+    if grain == 'year':
+        years = period.to_numpy(dtype='datetime64[ns]').astype(GRAINS['year']).astype('datetime64[ns]')
+        return pd.Series(years, index=period.index)
+    return pd.Series(pd.NaT, index=period.index, dtype='datetime64[ns]')
+
+
+def rollup(months, authors):
+    """Full cube from month rows plus author triples, both with a 'period' column."""
+    parts = [months.assign(grain='month')]
+    authors = authors.assign(author=_author_codes(authors['author']))
+    keys = ['period', 'dimension', 'member']
+    for grain in ['year', 'all']:
+        sums = aggregate(months.assign(period=_coarsen(months['period'], grain)), keys, sums=ADDITIVE)
+        distinct = aggregate(authors.assign(period=_coarsen(authors['period'], grain)), keys, nunique={'authors': 'author'})
+        part = sums.merge(distinct, on=keys, how='left').fillna({'authors': 0})
+        parts.append(part.assign(grain=grain))
+    cube = pd.concat(parts, ignore_index=True)
+    cube['period'] = cube['period'].astype('datetime64[ns]')
+    cube[MEASURES] = cube[MEASURES].astype('int64')
+    return cube[['grain', 'period', 'dimension', 'member', *MEASURES]]
+
+
+class Cube:
+    def __init__(self, table):
+        self.table = table
+        self._parts = {key: part for key, part in table.groupby(['grain', 'dimension'], sort=False)}
+
+    @classmethod
+    def build(cls, dataset):
+        return cls(build_cube(dataset))
+
+    @classmethod
+    def from_partitions(cls, months, authors):
+        return cls(rollup(months, authors))
+
+    def _part(self, grain, dimension):
+        if grain not in GRAINS or (dimension != 'all' and dimension not in DIMENSIONS):
+            raise KeyError(f'no cube slice for grain={grain!r}, dimension={dimension!r}')
+        return self._parts.get((grain, dimension), self.table.iloc[0:0])
+
+    def totals(self, dimension, measure='questions'):
+        """One value per member over the whole dataset, largest first."""
+        part = self._part('all', dimension)
+        totals = part.set_index('member')[measure].rename_axis(dimension)
+        return totals.sort_values(ascending=False, kind='stable')
+
+    def timeseries(self, measure='questions', grain='month', dimension='all', members=None):
+        """Measure per period; a Series for dimension 'all', else one column per member."""
+        part = self._part(grain, dimension)
+        if members is not None:
+            part = part[part['member'].isin(members)]
+        wide = part.pivot(index='period', columns='member', values=measure).fillna(0).astype('int64')
+        wide.index.name = grain.capitalize()
+        if dimension == 'all':
+            return wide[''].rename(measure) if '' in wide else pd.Series(dtype='int64', name=measure)
+        wide.columns.name = dimension
+        return wide if members is None else wide.reindex(columns=list(members), fill_value=0)
@@ -1,19 +1,43 @@
+import os
+
 import streamlit as st
-import pandas as pd
-import numpy as np
-
-@st.cache_data
-def load_data(file_path='data/data.parquet'):
-    df = pd.read_parquet(file_path)
-    df['Asked Date'] = pd.to_datetime(df['Asked Date'])
-    df['Modified Date'] = pd.to_datetime(df['Modified Date'])
-    
-    # Convert 'Views' to numeric, handling any non-numeric characters
-    df['Views'] = df['Views'].replace(r'[^0-9]', '', regex=True)
-    df['Views'] = pd.to_numeric(df['Views'], errors='coerce')
-    
-    df['Votes'] = pd.to_numeric(df['Votes'], errors='coerce')
-    df['Number of Answers'] = pd.to_numeric(df['Number of Answers'], errors='coerce')
-    df['Highest Score Answer Score'] = pd.to_numeric(df['Highest Score Answer Score'], errors='coerce')
-    
-    return df
\ No newline at end of file
+
+from utils.dataset import Dataset
+from utils.instrumentation import span
+from utils.partitions import MANIFEST
+from utils.schema import DATASET_PATH
+
+# Session state key holding the sidebar's global `Filters`.
+FILTERS_KEY = 'filters'
+
+
+@st.cache_resource(show_spinner=False, max_entries=2)
+def _load_dataset(file_path, modified):
+    # cache_resource hands every session the same object instead of a pickled
+    # copy; `modified` (the manifest's mtime) makes a fresh ingest or append
+    # replace the cached version.
+    return Dataset.read(file_path)
+
+
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _load_filtered(file_path, modified, filters):
+    # Sessions that pick the same filters share one filtered dataset.
+    return Dataset.read(file_path, filters)
+
+
+def get_dataset(file_path=DATASET_PATH, filters=None):
+    """The shared dataset narrowed to `filters`, by default the sidebar's global filters."""
+    filters = st.session_state.get(FILTERS_KEY) if filters is None else filters
+    manifest = os.path.join(file_path, MANIFEST)
+    if not os.path.exists(manifest):
+        st.error(f"No ingested dataset at `{file_path}`; run `python -m utils.ingest` first.")
+        st.stop()
+    modified = os.stat(manifest).st_mtime_ns
+    with span('load dataset'):
+        if not filters:
+            return _load_dataset(file_path, modified)
+        dataset = _load_filtered(file_path, modified, filters)
+    if not len(dataset):
+        st.warning("No questions match the current filters.")
+        st.stop()
+    return dataset
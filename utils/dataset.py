@@ -0,0 +1,172 @@
+"""In-process representation of the ingested dataset.
+
+Streamlit-free so it can be used from scripts; `utils.data_loader` wraps it in
+a resource cache so each server process holds exactly one copy.
+"""
+import hashlib
+import threading
+
+import numpy as np
+import pandas as pd
+
+from utils.categories import function_categories
+from utils.cooccurrence import Cooccurrence
+from utils.cube import Cube
+from utils.dtypes import to_frame
+from utils.hierarchy import dax_hierarchy
+from utils.hourly import HourlyActivity
+from utils.incidence import Incidence
+from utils.instrumentation import span
+from utils.kpis import KpiSummary
+from utils.list_parser import ListColumn
+from utils.partitions import TOP_K, PartitionStore
+from utils.postings import Postings
+from utils.search import SearchIndex, stored_index, term_table
+from utils.schema import CATEGORIES_PATH, DATASET_PATH, DIMENSIONS, HIERARCHY_PATH, SCHEMA_VERSION
+from utils.text_store import TextStore
+
+if int(pd.__version__.split('.')[0]) < 3:
+    # Projections and shallow copies handed to pages must never write through
+    # to the shared frame; pandas >= 3 always behaves this way.
+    pd.set_option('mode.copy_on_write', True)
+
+
+class Dataset:
+    def __init__(self, frame, metadata=None, store=None, text=None):
+        self._frame = frame
+        self.metadata = dict(metadata or {})
+        # With a partition store, the cube, co-occurrence and top-viewed indexes
+        # are combined from the per-month aggregates written at ingest.
+        self.store = store
+        # Long text columns missing from the frame are fetched from here.
+        self.text = text
+        self._derived = {}
+        self._lock = threading.RLock()
+
+    @classmethod
+    def read(cls, path=DATASET_PATH, filters=None):
+        """The whole dataset, or only the questions matching `filters` (a `utils.filters.Filters`)."""
+        store = PartitionStore(path)
+        if not store.months:
+            raise FileNotFoundError(f'no ingested dataset at {path}; run python -m utils.ingest first')
+        if store.metadata.get('schema_version') != SCHEMA_VERSION:
+            raise ValueError(f'{path} was written with schema version {store.metadata.get("schema_version")}; re-run python -m utils.ingest')
+        if not filters:
+            return cls(to_frame(store.read()), store.metadata, store, TextStore(store))
+        table = store.read(months=filters.months(store.months), filter=filters.expression())
+        if table is None:
+            table = store.read_month(store.months[0]).slice(0, 0)
+        # The per-month aggregates describe whole months, so a filtered dataset
+        # builds its indexes from its own rows.
+        digest = hashlib.sha256(repr(filters).encode()).hexdigest()[:8]
+        metadata = dict(store.metadata, dataset_version=f"{store.metadata['dataset_version']}-{digest}")
+        return cls(to_frame(filters.apply_lists(table)), metadata, text=TextStore(store))
+
+    @property
+    def version(self):
+        return self.metadata.get('dataset_version', '')
+
+    @property
+    def columns(self):
+        return list(self._frame.columns)
+
+    def __len__(self):
+        return len(self._frame)
+
+    def frame(self, columns=None):
+        # Copy-on-write makes both of these O(1): the caller gets its own
+        # frame object, but the column data is shared until someone writes.
+        if columns is None:
+            return self._frame.copy(deep=False)
+        return self._frame[list(columns)]
+
+    def rows(self, positions, columns=None):
+        """The questions at `positions`, with any text columns fetched for just these rows."""
+        columns = self.columns if columns is None else list(columns)
+        text = [column for column in columns if column not in self._frame]
+        frame = self._frame[[column for column in self._frame if column in columns or text and column == 'question_id']].iloc[positions]
+        if text:
+            fetched = self.text.fetch(frame['question_id'], text).set_axis(frame.index)
+            frame = frame.assign(**{column: fetched[column] for column in text})
+        return frame[columns]
+
+    def column(self, name):
+        return self._frame[name].copy(deep=False)
+
+    def derived(self, key, build):
+        """Memoize an index built from this dataset; sessions share the result."""
+        with self._lock:
+            if key not in self._derived:
+                with span(f'build {key}'):
+                    self._derived[key] = build()
+            return self._derived[key]
+
+    def list_column(self, name):
+        return self.derived(('list', name), lambda: ListColumn.from_series(self._frame[name]))
+
+    def incidence(self, name):
+        return self.derived(('incidence', name), lambda: Incidence.from_list_column(self.list_column(name)))
+
+    def _partitioned(self, name):
+        return self.store is not None and name == DIMENSIONS['function']
+
+    def cooccurrence(self, name='DAX Functions in Question'):
+        def build():
+            if self._partitioned(name):
+                return Cooccurrence.from_pair_tables(self.store.read_aggregate('cooccurrence'), len(self))
+            return Cooccurrence.from_incidence(self.incidence(name))
+        return self.derived(('cooccurrence', name), build)
+
+    def postings(self, name='DAX Functions in Question'):
+        def build():
+            if self._partitioned(name):
+                return Postings.from_top_tables(self.store.read_aggregate('top'), self.store.offsets(), TOP_K)
+            return Postings.from_incidence(self.incidence(name), self._views())
+        return self.derived(('postings', name), build)
+
+    def _views(self):
+        return self._frame['Views'].astype('float64').to_numpy(na_value=float('nan'))
+
+    def cube(self):
+        def build():
+            if self.store is None:
+                return Cube.build(self)
+            return Cube.from_partitions(self.store.read_aggregate('cube'), self.store.read_aggregate('authors'))
+        return self.derived('cube', build)
+
+    def kpi_summary(self):
+        def build():
+            if self.store is None:
+                return KpiSummary.from_frame(self._frame)
+            return KpiSummary.from_tables(self.store.read_aggregate('kpis'), self.store.read_aggregate('kpi_counts'))
+        return self.derived('kpis', build)
+
+    def search_index(self):
+        def build():
+            # Filtered datasets search the full store's index, limited to their own rows.
+            store = self.store or getattr(self.text, 'store', None)
+            if store is None:
+                return SearchIndex.from_terms(term_table(self._frame))
+            return stored_index(store)
+        return self.derived('search', build)
+
+    def search(self, query, k, rows=None):
+        """Positions and BM25 scores of the `k` best matches for `query`, optionally only among `rows`."""
+        index = self.search_index()
+        docs = self.derived('search docs', lambda: index.doc_codes(self._frame['question_id']))
+        if rows is None:
+            return index.rank(query, docs, k)
+        rows = np.asarray(rows, dtype=np.int64)
+        matches, scores = index.rank(query, docs[rows], k)
+        return rows[matches], scores
+
+    def hourly(self):
+        return self.derived('hourly', lambda: HourlyActivity.from_frame(self._frame))
+
+    def category_usage(self, path=CATEGORIES_PATH):
+        return self.derived(('category_usage', path), lambda: function_categories(path).usage(self.cube().totals('function')))
+
+    def hierarchy(self, path=HIERARCHY_PATH):
+        def build():
+            return dax_hierarchy(path).rollup(self.incidence(DIMENSIONS['function']), self._views(), self._frame['difficulty_level'])
+        return self.derived(('hierarchy', path), build)
@@ -0,0 +1,100 @@
+"""DAX code tokenizer: function calls, table/column references and variables.
+
+One compiled pattern scans a snippet left to right. String literals and
+comments are matched (and skipped) before anything else, so names inside
+them are never counted; identifiers that are neither called nor followed by
+a column reference are consumed whole so their suffixes can't match either.
+
+`extract` runs the scan over columns of snippets in chunks on a process pool
+and returns one `ListColumn` per `CODE_COLUMNS` entry (function calls
+upper-cased; names in order of first appearance), which ingest stores as
+Arrow list columns.
+"""
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+
+from utils.list_parser import ListColumn
+from utils.schema import CODE_COLUMNS
+
+TOKEN_PATTERN = re.compile(r'''
+    "(?:[^"]|"")*"?                                  # string literal
+  | //[^\n]* | --[^\n]* | /\*(?:.|\n)*?(?:\*/|$)     # comments
+  | \bVAR\s+(?P<variable>[A-Za-z_]\w*)               # variable declaration
+  | (?P<function>[A-Za-z_][\w.]*)\s*\(               # function call
+  | (?P<table>'(?:[^']|'')+'|[A-Za-z_]\w*)?\[(?P<column>(?:[^\]]|\]\])*)\]   # column or measure reference
+  | '(?:[^']|'')*'? | [A-Za-z_][\w.]* | \d[\w.]*      # any other table name, identifier or number
+''', re.VERBOSE | re.IGNORECASE)
+
+# Keywords that may be followed by a parenthesis without being a call.
+KEYWORDS = {'VAR', 'RETURN', 'IN', 'DEFINE', 'EVALUATE', 'MEASURE', 'ORDER', 'BY', 'ASC', 'DESC'}
+CHUNK_SIZE = 20_000
+
+
+def _table_name(table):
+    if table.startswith("'"):
+        return table[1:-1].replace("''", "'")
+    return table
+
+
+def _scan(code, functions, tables, columns, variables):
+    # Dicts keep first-appearance order and drop repeats.
+    for variable, function, table, column in TOKEN_PATTERN.findall(code):
+        if function:
+            function = function.upper()
+            if function not in KEYWORDS:
+                functions[function] = None
+        elif variable:
+            variables[variable] = None
+        elif table:
+            table = _table_name(table)
+            tables[table] = None
+            columns[f'{table}[{column.replace("]]", "]")}]'] = None
+        elif column:
+            columns[f'[{column.replace("]]", "]")}]'] = None
+
+
+def tokenize(*codes):
+    """(functions, tables, columns, variables) used across DAX snippets; missing snippets are skipped."""
+    found = tuple({} for _ in CODE_COLUMNS)
+    for code in codes:
+        if isinstance(code, str):
+            _scan(code, *found)
+    return tuple(list(names) for names in found)
+
+
+def _chunk(snippets):
+    """(lengths, values) per output column for a list of per-question snippet tuples."""
+    rows = [tokenize(*codes) for codes in snippets]
+    result = {}
+    for i, name in enumerate(CODE_COLUMNS):
+        lengths = np.fromiter((len(row[i]) for row in rows), dtype=np.int64, count=len(rows))
+        values = np.array([value for row in rows for value in row[i]], dtype=object)
+        result[name] = (lengths, values)
+    return result
+
+
+def extract(*columns, jobs=None, chunk_size=CHUNK_SIZE):
+    """Names used across the given code columns (one snippet per question in each).
+
+    Returns {code column: ListColumn}. With more than one chunk of questions
+    the chunks run on `jobs` processes (default: every CPU).
+    """
+    snippets = list(zip(*columns))
+    chunks = [snippets[start:start + chunk_size] for start in range(0, len(snippets), chunk_size)]
+    jobs = jobs or os.cpu_count() or 1
+    if len(chunks) > 1 and jobs > 1:
+        with ProcessPoolExecutor(max_workers=min(jobs, len(chunks))) as pool:
+            parts = list(pool.map(_chunk, chunks))
+    else:
+        parts = [_chunk(chunk) for chunk in chunks]
+    result = {}
+    for name in CODE_COLUMNS:
+        lengths = np.concatenate([part[name][0] for part in parts]) if parts else np.empty(0, dtype=np.int64)
+        values = np.concatenate([part[name][1] for part in parts]) if parts else np.empty(0, dtype=object)
+        offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        result[name] = ListColumn(offsets, values.astype(object), np.empty(0, dtype=np.int64))
+    return result
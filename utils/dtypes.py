@@ -0,0 +1,120 @@
+"""Compact in-memory layout for the loaded question frame.
+
+    python -m utils.dtypes [data/dataset]    memory per column, before and after
+
+Arrow's default conversion leaves repeated strings (authors, difficulty, the
+items of every list column) as Python objects and nullable counts as float64.
+`to_frame` instead dictionary-encodes authors and difficulty into pandas
+categoricals, keeps list columns as Arrow lists of dictionary codes into one
+interned vocabulary per column, and stores counts as nullable int32. Dates
+stay datetime64 and other strings stay in Arrow buffers.
+"""
+import argparse
+import sys
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from utils.schema import CATEGORICAL_COLUMNS, CODE_COLUMNS, COUNT_COLUMNS, DATASET_PATH, LIST_COLUMNS
+
+INT32 = np.iinfo(np.int32)
+# pandas >= 3 keeps strings in Arrow buffers by default.
+OBJECT_STRINGS = int(pd.__version__.split('.')[0]) < 3
+
+
+def _count_type(column):
+    # Counts that do not fit stay 64-bit rather than failing the load.
+    low, high = pc.min_max(column).values()
+    fits = low.as_py() is None or (INT32.min <= low.as_py() and high.as_py() <= INT32.max)
+    return pa.int32() if fits else pa.int64()
+
+
+def _encode_list(column):
+    column = column.combine_chunks() if isinstance(column, pa.ChunkedArray) else column
+    if pa.types.is_dictionary(column.type.value_type):
+        return column
+    offsets = pc.subtract(column.offsets, column.offsets[0])
+    values = pc.dictionary_encode(column.flatten())
+    return pa.ListArray.from_arrays(offsets, values, mask=column.is_null() if column.null_count else None)
+
+
+def compact_table(table):
+    """`table` with the compact column types `to_frame` converts from."""
+    columns = []
+    for name in table.column_names:
+        column = table[name]
+        if name in COUNT_COLUMNS:
+            column = column.cast(_count_type(column))
+        elif name in CATEGORICAL_COLUMNS and not pa.types.is_dictionary(column.type):
+            column = pc.dictionary_encode(column)
+        elif name in LIST_COLUMNS or name in CODE_COLUMNS:
+            column = _encode_list(column)
+        columns.append(column)
+    # One chunk per column rather than one per month partition keeps row
+    # lookups on the Arrow-backed columns cheap.
+    return pa.table(columns, names=table.column_names).combine_chunks()
+
+
+def _pandas_type(arrow_type):
+    if pa.types.is_list(arrow_type):
+        return pd.ArrowDtype(arrow_type)
+    if OBJECT_STRINGS and pa.types.is_string(arrow_type):
+        return pd.StringDtype('pyarrow')
+    return {pa.int32(): pd.Int32Dtype(), pa.int64(): pd.Int64Dtype()}.get(arrow_type)
+
+
+def to_frame(table):
+    """The pandas frame the dataset holds for an Arrow table of questions."""
+    return compact_table(table).to_pandas(types_mapper=_pandas_type)
+
+
+def _object_bytes(values):
+    # Object columns hold references; each distinct object (and for list
+    # columns, each distinct item) is counted once.
+    seen, total = set(), values.nbytes
+    stack = list(values)
+    while stack:
+        value = stack.pop()
+        if id(value) in seen:
+            continue
+        seen.add(id(value))
+        total += sys.getsizeof(value)
+        if isinstance(value, np.ndarray) and value.dtype == object:
+            stack.extend(value)
+    return total
+
+
+def column_bytes(series):
+    if series.dtype == object:
+        return _object_bytes(series.to_numpy())
+    return int(series.memory_usage(deep=True, index=False))
+
+
+def memory_report(table):
+    """Bytes per column with Arrow's default conversion ('before') and with `to_frame` ('after')."""
+    before, after = table.to_pandas(), to_frame(table)
+    report = pd.DataFrame({
+        'before': [column_bytes(before[name]) for name in table.column_names],
+        'after': [column_bytes(after[name]) for name in table.column_names],
+        'before_dtype': [str(before[name].dtype) for name in table.column_names],
+        'after_dtype': [str(after[name].dtype) for name in table.column_names],
+    }, index=pd.Index(table.column_names, name='column'))
+    report.loc['total', ['before', 'after']] = report[['before', 'after']].sum()
+    return report
+
+
+def main(argv=None):
+    from utils.partitions import PartitionStore
+
+    parser = argparse.ArgumentParser(description='Per-column memory of the loaded dataset.')
+    parser.add_argument('path', nargs='?', default=DATASET_PATH)
+    args = parser.parse_args(argv)
+    report = memory_report(PartitionStore(args.path).read())
+    report[['before', 'after']] = (report[['before', 'after']] / 2 ** 20).round(2)
+    print(report.rename(columns={'before': 'before_mib', 'after': 'after_mib'}).fillna('').to_string())
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,93 @@
+"""Process-wide LRU cache of built chart figures.
+
+Every session sees the same chart for the same inputs, so a figure is built
+once per (dataset version, chart name, widget parameters) and then shared.
+The dataset version changes with each ingest and with the global filters,
+so cached figures never outlive their data. Hits and misses are counted per
+chart for the performance panel and the Prometheus export.
+
+Cached figures are shared between sessions and must not be modified.
+"""
+import threading
+from collections import OrderedDict
+from datetime import date, datetime
+
+import numpy as np
+
+from utils.instrumentation import _escape
+
+
+def normalize(value):
+    """Hashable, order-stable form of a widget value."""
+    if isinstance(value, dict):
+        return tuple(sorted((str(k), normalize(v)) for k, v in value.items()))
+    if isinstance(value, (set, frozenset)):
+        return tuple(sorted(normalize(v) for v in value))
+    if isinstance(value, (list, tuple, np.ndarray)):
+        return tuple(normalize(v) for v in value)
+    if isinstance(value, np.generic):
+        return value.item()
+    if isinstance(value, (date, datetime)):
+        return value.isoformat()
+    return value
+
+
+class FigureCache:
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self._figures = OrderedDict()
+        self._counts = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(version, name, params=None):
+        return version, name, normalize(params or {})
+
+    def _count(self, name, hit):
+        hits, misses = self._counts.get(name, (0, 0))
+        self._counts[name] = (hits + hit, misses + (not hit))
+
+    def get(self, key, build):
+        """The cached figure for `key`, built with `build()` on a miss."""
+        name = key[1]
+        with self._lock:
+            if key in self._figures:
+                self._figures.move_to_end(key)
+                self._count(name, True)
+                return self._figures[key]
+            self._count(name, False)
+        # Built outside the lock so one slow chart doesn't hold up the others;
+        # two sessions missing at once both build and the last one is kept.
+        figure = build()
+        with self._lock:
+            self._figures[key] = figure
+            self._figures.move_to_end(key)
+            while len(self._figures) > self.maxsize:
+                self._figures.popitem(last=False)
+        return figure
+
+    def __len__(self):
+        return len(self._figures)
+
+    def stats(self):
+        """Hits and misses per chart name, as {name: (hits, misses)}."""
+        with self._lock:
+            return dict(self._counts)
+
+    def prometheus(self):
+        lines = [
+            '# HELP dax_figure_cache_requests_total Figure cache lookups by chart and result.',
+            '# TYPE dax_figure_cache_requests_total counter',
+        ]
+        for name, (hits, misses) in sorted(self.stats().items()):
+            lines.append(f'dax_figure_cache_requests_total{{chart="{_escape(name)}",result="hit"}} {hits}')
+            lines.append(f'dax_figure_cache_requests_total{{chart="{_escape(name)}",result="miss"}} {misses}')
+        lines += [
+            '# HELP dax_figure_cache_entries Figures currently cached.',
+            '# TYPE dax_figure_cache_entries gauge',
+            f'dax_figure_cache_entries {len(self)}',
+        ]
+        return '\n'.join(lines) + '\n'
+
+
+FIGURES = FigureCache()
@@ -0,0 +1,182 @@
+"""Leaner Plotly payloads for the browser.
+
+`compact_figure` returns a copy of a figure with duplicate traces merged,
+traces that can never be shown dropped, long lines downsampled with LTTB
+(Largest-Triangle-Three-Buckets, which keeps the peaks and dips), count
+histograms sent as one (value, count) pair per distinct value instead of
+every sample, and data arrays shortened: integral floats become ints, other
+floats keep `SIGNIFICANT_DIGITS` digits and dates lose all-zero time parts.
+"""
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+import plotly.graph_objects as go
+
+# Points kept per line trace; longer series are downsampled.
+POINT_BUDGET = 1000
+SIGNIFICANT_DIGITS = 6
+# Trace types that have no legend entry unless asked for, so 'legendonly' hides them for good.
+NO_LEGEND = {'heatmap', 'contour', 'histogram2d', 'histogram2dcontour'}
+# Per-point attributes that have to follow the downsampled x/y.
+POINT_ATTRIBUTES = ['text', 'hovertext', 'customdata']
+
+
+def lttb(x, y, threshold):
+    """Positions of the `threshold` points of (x, y) that LTTB keeps, in order."""
+    n = len(x)
+    if threshold >= n or threshold < 3:
+        return np.arange(n)
+    x = np.asarray(x, dtype=np.float64)
+    y = np.asarray(y, dtype=np.float64)
+    # First and last points are always kept; the rest is split into equal buckets.
+    edges = np.linspace(1, n - 1, threshold - 1).astype(np.int64)
+    keep = np.empty(threshold, dtype=np.int64)
+    keep[0], keep[-1] = 0, n - 1
+    previous = 0
+    for bucket in range(threshold - 2):
+        start, end = edges[bucket], edges[bucket + 1]
+        following = slice(end, edges[bucket + 2] if bucket + 2 < len(edges) else n)
+        target_x, target_y = x[following].mean(), y[following].mean()
+        area = np.abs(
+            (x[previous] - target_x) * (y[start:end] - y[previous])
+            - (x[previous] - x[start:end]) * (target_y - y[previous])
+        )
+        previous = start + int(np.argmax(area))
+        keep[bucket + 1] = previous
+    return keep
+
+
+def _numeric(values):
+    """Float view of an array, or None if it holds anything but numbers and gaps."""
+    if values is None or isinstance(values, str):
+        return None
+    array = np.asarray(values)
+    if array.dtype.kind in 'iuf':
+        return array.astype(np.float64)
+    if array.dtype.kind == 'O' and all(v is None or isinstance(v, (int, float)) and not isinstance(v, bool) for v in array.flat):
+        return array.astype(np.float64)
+    return None
+
+
+def _dates(values):
+    """datetime64 view of an array of naive dates (plotly keeps them as datetime objects), else None."""
+    array = np.asarray(values)
+    if array.dtype.kind == 'M':
+        return array
+    if array.dtype.kind == 'O' and array.size and all(isinstance(v, datetime) for v in array.flat):
+        dates = pd.DatetimeIndex(array.ravel())
+        if dates.tz is None:
+            return dates.to_numpy().reshape(array.shape)
+    return None
+
+
+def _positions(values):
+    """Sortable numbers for x values (dates become nanoseconds, labels their positions)."""
+    array = np.asarray(values)
+    dates = _dates(array)
+    if dates is not None:
+        return dates.astype('datetime64[ns]').astype(np.int64).astype(np.float64)
+    numeric = _numeric(array)
+    return numeric if numeric is not None else np.arange(len(array), dtype=np.float64)
+
+
+def _hidden(trace):
+    if trace.visible is False:
+        return True
+    return trace.visible == 'legendonly' and trace.type in NO_LEGEND and not trace.showlegend
+
+
+def _duplicate(kept, trace):
+    """The already kept trace that draws the same points as `trace`, if any."""
+    if trace.type != 'scatter' or trace.showlegend is not False:
+        return None
+    for other in kept:
+        same_axes = (other.xaxis or 'x', other.yaxis or 'y') == (trace.xaxis or 'x', trace.yaxis or 'y')
+        if other.type == 'scatter' and same_axes:
+            if np.array_equal(np.asarray(other.x), np.asarray(trace.x)) and np.array_equal(np.asarray(other.y), np.asarray(trace.y)):
+                return other
+    return None
+
+
+def _merge(target, duplicate):
+    modes = set((target.mode or 'lines').split('+')) | set((duplicate.mode or 'lines').split('+'))
+    target.mode = '+'.join(mode for mode in ['lines', 'markers', 'text'] if mode in modes)
+    if 'markers' in (duplicate.mode or ''):
+        target.marker = duplicate.marker
+
+
+def _downsample(trace, budget):
+    if trace.type not in ('scatter', 'scattergl') or 'lines' not in (trace.mode or 'lines') or trace.x is None:
+        return
+    y = _numeric(trace.y)
+    if y is None or len(y) <= budget or np.isnan(y).any():
+        return
+    x = _positions(trace.x)
+    if np.any(np.diff(x) < 0):
+        return
+    keep = lttb(x, y, budget)
+    updates = {'x': np.asarray(trace.x)[keep], 'y': np.asarray(trace.y)[keep]}
+    for name in POINT_ATTRIBUTES:
+        values = trace[name]
+        if values is not None and not isinstance(values, str) and len(values) == len(y):
+            updates[name] = np.asarray(values)[keep]
+    trace.update(updates)
+
+
+def _aggregate_histogram(trace):
+    # With a fixed bin count plotly derives the bins from the data range alone,
+    # so summing per-value counts draws the same bars.
+    if trace.type != 'histogram' or trace.x is None or trace.y is not None or not trace.nbinsx:
+        return
+    if trace.histfunc not in (None, 'count') or trace.histnorm:
+        return
+    counts = pd.Series(np.asarray(trace.x)).value_counts().sort_index()
+    if len(counts) < len(trace.x):
+        trace.update(x=counts.index.to_numpy(), y=counts.to_numpy(), histfunc='sum')
+
+
+def compact_array(values):
+    """Shorter JSON for a data array; anything that isn't numbers or dates is returned as is."""
+    if values is None or isinstance(values, str):
+        return values
+    array = np.asarray(values)
+    dates = _dates(array)
+    if dates is not None:
+        for unit in ['M', 'D', 'm', 's']:
+            coarse = dates.astype(f'datetime64[{unit}]')
+            if (coarse == dates).all():
+                return np.datetime_as_string(coarse, unit=unit).astype(object)
+        return values
+    numbers = _numeric(array)
+    if numbers is None or numbers.size == 0:
+        return values
+    finite = np.isfinite(numbers)
+    if finite.all() and (numbers == np.round(numbers)).all() and np.abs(numbers).max() < 2 ** 53:
+        return numbers.astype(np.int64)
+    magnitude = np.floor(np.log10(np.abs(numbers), where=finite & (numbers != 0), out=np.zeros_like(numbers)))
+    # Dividing by an exact power of ten keeps the shortest decimal repr.
+    digits = SIGNIFICANT_DIGITS - 1 - magnitude
+    up, down = 10.0 ** np.maximum(digits, 0), 10.0 ** np.maximum(-digits, 0)
+    return np.where(finite, np.round(numbers * up / down) * down / up, numbers)
+
+
+def compact_figure(fig, budget=POINT_BUDGET):
+    fig = go.Figure(fig)
+    kept = []
+    for trace in fig.data:
+        if _hidden(trace):
+            continue
+        duplicate = _duplicate(kept, trace)
+        if duplicate is not None:
+            _merge(duplicate, trace)
+            continue
+        kept.append(trace)
+    fig.data = kept
+    for trace in fig.data:
+        _downsample(trace, budget)
+        _aggregate_histogram(trace)
+        for name in ['x', 'y', 'z']:
+            if name in trace and trace[name] is not None:
+                trace[name] = compact_array(trace[name])
+    return fig
@@ -0,0 +1,45 @@
+"""Sidebar filter bar shared by every page.
+
+Rendered from `main.py` before the page runs, so the selection survives page
+switches. The chosen `Filters` go into session state, where
+`utils.data_loader.get_dataset` picks them up for every page.
+"""
+import streamlit as st
+
+from utils.data_loader import FILTERS_KEY, get_dataset
+from utils.filters import Filters
+
+WIDGETS = {
+    'industries': ("Industry", 'industry'),
+    'difficulties': ("Difficulty", 'difficulty'),
+    'categories': ("Category", 'category'),
+    'concepts': ("Concept", 'concept'),
+}
+
+
+def _clear():
+    for key in ['filter_dates', *(f'filter_{name}' for name in WIDGETS)]:
+        st.session_state.pop(key, None)
+
+
+def render_filter_bar():
+    full = get_dataset(filters=Filters())
+    asked = full.column('Asked Date').dropna()
+    first, last = asked.min().date(), asked.max().date()
+    cube = full.cube()
+
+    with st.sidebar.expander("🔎 Filters", expanded=bool(st.session_state.get(FILTERS_KEY))):
+        dates = st.date_input("Asked between", value=(first, last), min_value=first, max_value=last, key='filter_dates')
+        selected = {
+            name: tuple(st.multiselect(label, cube.totals(dimension).index, key=f'filter_{name}'))
+            for name, (label, dimension) in WIDGETS.items()
+        }
+        st.button("Clear filters", on_click=_clear)
+
+    # The range picker returns a single date while the second one is being chosen.
+    start, end = dates if len(dates) == 2 else (first, last)
+    filters = Filters(start=start if start > first else None, end=end if end < last else None, **selected)
+    st.session_state[FILTERS_KEY] = filters
+    if filters:
+        st.sidebar.caption(f"Showing {len(get_dataset()):,} of {len(full):,} questions")
+    return filters
@@ -0,0 +1,92 @@
+"""Global question filters (date range, industry, difficulty, category, concept).
+
+Applied while reading the partition store: month partitions outside the date
+range are never opened, the Asked Date and difficulty predicates are pushed
+down to Parquet row-group statistics, and only the rows that survive are
+checked against the list columns. Streamlit-free; `utils.filter_bar` holds
+the sidebar widgets.
+"""
+from dataclasses import dataclass
+from datetime import date
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.dataset as ds
+
+from utils.partitions import UNDATED
+from utils.schema import DIMENSIONS
+
+# Filter field -> dataset column. List columns match a question when any item is selected.
+LIST_FILTERS = {
+    'industries': DIMENSIONS['industry'],
+    'categories': DIMENSIONS['category'],
+    'concepts': DIMENSIONS['concept'],
+}
+
+
+@dataclass(frozen=True)
+class Filters:
+    start: date | None = None
+    end: date | None = None
+    industries: tuple = ()
+    difficulties: tuple = ()
+    categories: tuple = ()
+    concepts: tuple = ()
+
+    def __bool__(self):
+        return self != Filters()
+
+    def _bounds(self):
+        # Whole UTC days, `end` included.
+        start = None if self.start is None else pd.Timestamp(self.start, tz='UTC')
+        end = None if self.end is None else pd.Timestamp(self.end, tz='UTC') + pd.Timedelta(days=1)
+        return start, end
+
+    def months(self, months):
+        """The month partitions that can hold matching questions."""
+        start, end = self._bounds()
+        if start is None and end is None:
+            return list(months)
+        keep = []
+        for month in months:
+            if month == UNDATED:
+                continue
+            first = pd.Timestamp(month, tz='UTC')
+            if (start is None or first + pd.offsets.MonthBegin(1) > start) and (end is None or first < end):
+                keep.append(month)
+        return keep
+
+    def expression(self):
+        """Predicate on scalar columns, for Parquet row-group pruning; None if there is none."""
+        start, end = self._bounds()
+        predicates = []
+        if start is not None:
+            predicates.append(ds.field('Asked Date') >= pa.scalar(start.to_pydatetime()))
+        if end is not None:
+            predicates.append(ds.field('Asked Date') < pa.scalar(end.to_pydatetime()))
+        if self.difficulties:
+            predicates.append(ds.field(DIMENSIONS['difficulty']).isin(list(self.difficulties)))
+        expression = None
+        for predicate in predicates:
+            expression = predicate if expression is None else expression & predicate
+        return expression
+
+    def apply_lists(self, table):
+        """Keep the rows of `table` whose list columns contain a selected item."""
+        mask = np.ones(table.num_rows, dtype=bool)
+        for name, column in LIST_FILTERS.items():
+            selected = getattr(self, name)
+            if selected:
+                mask &= _contains_any(table[column], selected)
+        return table if mask.all() else table.filter(pa.array(mask))
+
+
+def _contains_any(column, values):
+    column = column.combine_chunks() if isinstance(column, pa.ChunkedArray) else column
+    hits = pc.is_in(pc.list_flatten(column), value_set=pa.array(list(values), type=pa.string()))
+    parents = pc.list_parent_indices(column).to_numpy()
+    mask = np.zeros(len(column), dtype=bool)
+    mask[parents[hits.to_numpy(zero_copy_only=False)]] = True
+    return mask
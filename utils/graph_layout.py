@@ -0,0 +1,111 @@
+"""Force-directed layout for the co-occurrence network.
+
+A vectorized Fruchterman-Reingold solver with a fixed iteration budget, plus
+a process-wide LRU cache of finished layouts. When the node set changes (the
+top-N slider moves), nodes that were already on screen start from their last
+position so the graph settles instead of being reshuffled.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+
+
+def force_layout(adjacency, initial, iterations=50, temperature=0.1, seed=0):
+    """Fruchterman-Reingold on a dense weighted adjacency matrix, scaled into [-1, 1]."""
+    n = len(adjacency)
+    if n == 0:
+        return np.empty((0, 2))
+    if n == 1:
+        return np.zeros((1, 2))
+
+    pos = np.array(initial, dtype=np.float64)
+    peak = adjacency.max()
+    weights = adjacency / peak if peak > 0 else adjacency
+    k = np.sqrt(1.0 / n)
+    cooling = temperature / (iterations + 1)
+    jitter = np.random.default_rng(seed)
+
+    for _ in range(iterations):
+        delta = pos[:, None, :] - pos[None, :, :]
+        distance = np.linalg.norm(delta, axis=-1)
+        np.clip(distance, 0.01, None, out=distance)
+        force = k * k / distance ** 2 - weights * distance / k
+        displacement = np.einsum('ijk,ij->ik', delta, force)
+        length = np.linalg.norm(displacement, axis=-1)
+        np.clip(length, 0.01, None, out=length)
+        pos += displacement * (temperature / length)[:, None]
+        temperature -= cooling
+
+    # Coincident nodes get no repulsive direction; nudge them apart.
+    if np.ptp(pos, axis=0).max() < 1e-9:
+        pos += jitter.uniform(-0.01, 0.01, pos.shape)
+
+    pos -= pos.mean(axis=0)
+    scale = np.abs(pos).max()
+    return pos / scale if scale > 0 else pos
+
+
+class LayoutCache:
+    def __init__(self, maxsize=64, iterations=50, seed=0):
+        self.maxsize = maxsize
+        self.iterations = iterations
+        self.seed = seed
+        self._layouts = OrderedDict()
+        self._positions = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(nodes, edges):
+        return (
+            tuple(sorted(nodes)),
+            tuple(sorted((min(s, t), max(s, t), round(float(w), 6)) for s, t, w in edges)),
+        )
+
+    def _initial(self, nodes, adjacency):
+        rng = np.random.default_rng(self.seed)
+        initial = rng.uniform(-1, 1, (len(nodes), 2))
+        known = np.array([node in self._positions for node in nodes], dtype=bool)
+        for i in np.flatnonzero(known):
+            initial[i] = self._positions[nodes[i]]
+        # New nodes start next to the already-placed nodes they connect to.
+        for i in np.flatnonzero(~known):
+            neighbours = np.flatnonzero((adjacency[i] > 0) & known)
+            if len(neighbours):
+                initial[i] = initial[neighbours].mean(axis=0) + rng.normal(0, 0.05, 2)
+        return initial, known.any()
+
+    def layout(self, nodes, edges):
+        """Positions for `nodes` given (source, target, weight) edges, as {node: (x, y)}."""
+        nodes = list(nodes)
+        edges = [(s, t, w) for s, t, w in edges if s in nodes and t in nodes]
+        key = self.key(nodes, edges)
+
+        with self._lock:
+            if key in self._layouts:
+                self._layouts.move_to_end(key)
+                return dict(self._layouts[key])
+
+            index = {node: i for i, node in enumerate(nodes)}
+            adjacency = np.zeros((len(nodes), len(nodes)))
+            for source, target, weight in edges:
+                adjacency[index[source], index[target]] = adjacency[index[target], index[source]] = weight
+
+            initial, warm = self._initial(nodes, adjacency)
+            # A warm start only needs to settle new nodes, so it runs cooler.
+            pos = force_layout(
+                adjacency, initial,
+                iterations=self.iterations,
+                temperature=0.02 if warm else 0.1,
+                seed=self.seed,
+            )
+
+            result = {node: (float(x), float(y)) for node, (x, y) in zip(nodes, pos)}
+            self._positions.update(result)
+            self._layouts[key] = result
+            while len(self._layouts) > self.maxsize:
+                self._layouts.popitem(last=False)
+            return dict(result)
+
+
+LAYOUTS = LayoutCache()
@@ -0,0 +1,150 @@
+"""Concept -> category -> function hierarchy from ``data/dax_hierarchy.json``.
+
+The JSON nests functions under categories under concepts. A category can sit
+under several concepts and a function under several categories, so one name
+can label several nodes. The tree is held as flat preorder arrays (label,
+parent, level, subtree end): node i's subtree is the contiguous slice
+[i, end[i]), and the arrays are also the ids/labels/parents layout that
+Plotly's sunburst and icicle charts take.
+
+`HierarchyRollup` computes every node's measures in one pass. A sparse
+function x node matrix (each function marks its leaves and their ancestors)
+turns the question x function incidence into question x node membership, so
+question counts, views and the difficulty mix are column sums over it and a
+question using two functions of one category counts once for that category.
+Drilling into a node is then a slice of the precomputed table.
+"""
+import json
+from functools import lru_cache
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+from utils.schema import HIERARCHY_PATH
+
+LEVELS = ['concept', 'category', 'function']
+
+
+def _children(tree):
+    """(label, children) pairs for the JSON's Concepts -> Categories -> functions nesting."""
+    return [
+        (concept, [
+            (category, [(function, []) for function in dict.fromkeys(functions)])
+            for category, functions in body['Categories'].items()
+        ])
+        for concept, body in tree['Concepts'].items()
+    ]
+
+
+class Hierarchy:
+    def __init__(self, tree):
+        labels, parents, levels, ends, ids = [], [], [], [], []
+
+        def visit(label, children, parent, level):
+            node = len(labels)
+            labels.append(label)
+            parents.append(parent)
+            levels.append(level)
+            ends.append(None)
+            ids.append(label if parent < 0 else f'{ids[parent]}/{label}')
+            for child, grandchildren in children:
+                visit(child, grandchildren, node, level + 1)
+            ends[node] = len(labels)
+
+        for label, children in _children(tree):
+            visit(label, children, -1, 0)
+        self.labels = np.array(labels, dtype=object)
+        self.parents = np.array(parents, dtype=np.int64)
+        self.levels = np.array(levels, dtype=np.int8)
+        self.ends = np.array(ends, dtype=np.int64)
+        self.ids = np.array(ids, dtype=object)
+        self._nodes = {node_id: node for node, node_id in enumerate(ids)}
+
+    @classmethod
+    def load(cls, path=HIERARCHY_PATH):
+        with open(path) as f:
+            return cls(json.load(f))
+
+    def __len__(self):
+        return len(self.labels)
+
+    def node(self, node_id):
+        return self._nodes[node_id]
+
+    def membership(self, vocabulary):
+        """Function (in `vocabulary` order) x node matrix: 1 where the node is, or is above, a leaf for that function."""
+        codes = {name: code for code, name in enumerate(vocabulary)}
+        rows, cols = [], []
+        for leaf in np.flatnonzero(self.levels == len(LEVELS) - 1):
+            code = codes.get(self.labels[leaf])
+            node = leaf if code is not None else -1
+            while node >= 0:
+                rows.append(code)
+                cols.append(node)
+                node = self.parents[node]
+        matrix = sparse.csr_matrix(
+            (np.ones(len(rows), dtype=np.int32), (rows, cols)),
+            shape=(len(vocabulary), len(self)),
+        )
+        # A function under two categories of one concept marks that concept once.
+        matrix.sum_duplicates()
+        matrix.data[:] = 1
+        return matrix
+
+    def rollup(self, incidence, views, difficulty):
+        return HierarchyRollup(self, incidence, views, difficulty)
+
+
+@lru_cache(maxsize=4)
+def dax_hierarchy(path=HIERARCHY_PATH):
+    """Process-wide, read-only tree loaded from the hierarchy JSON."""
+    return Hierarchy.load(path)
+
+
+class HierarchyRollup:
+    """Questions, views and difficulty mix at every node, computed once from the function incidence."""
+
+    def __init__(self, hierarchy, incidence, views, difficulty):
+        self.hierarchy = hierarchy
+        present = (incidence.matrix @ hierarchy.membership(incidence.vocabulary)).tocsc()
+        present.data[:] = 1
+        codes, self.difficulty_levels = pd.factorize(pd.Series(difficulty).reset_index(drop=True), sort=True)
+        known = codes >= 0
+        by_difficulty = sparse.csr_matrix(
+            (np.ones(known.sum(), dtype=np.int32), (codes[known], np.flatnonzero(known))),
+            shape=(len(self.difficulty_levels), present.shape[0]),
+        )
+        # Sector sizes must add up from leaves to the root, which distinct
+        # question counts don't once a question spans several categories; a
+        # node's mentions are the sum of its leaves' question counts.
+        questions = np.asarray(present.sum(axis=0)).ravel().astype(np.int64)
+        mentions = np.where(hierarchy.levels == len(LEVELS) - 1, questions, 0)
+        for level in range(len(LEVELS) - 1, 0, -1):
+            nodes = np.flatnonzero(hierarchy.levels == level)
+            np.add.at(mentions, hierarchy.parents[nodes], mentions[nodes])
+        parents = np.where(hierarchy.parents >= 0, hierarchy.ids[np.maximum(hierarchy.parents, 0)], '')
+        self.table = pd.DataFrame({
+            'id': hierarchy.ids,
+            'label': hierarchy.labels,
+            'parent': parents,
+            'level': np.array(LEVELS, dtype=object)[hierarchy.levels],
+            'questions': questions,
+            'mentions': mentions,
+            'views': present.T @ np.nan_to_num(views),
+            **dict(zip(self.difficulty_levels, (by_difficulty @ present).toarray().astype(np.int64))),
+        })
+
+    def subtree(self, node_id=None, depth=None):
+        """Rows for `node_id` and everything below it (all concepts if None), down to `depth` levels; the first row is the root."""
+        if node_id is None:
+            table = self.table
+            top = 0
+        else:
+            node = self.hierarchy.node(node_id)
+            table = self.table.iloc[node:self.hierarchy.ends[node]].copy()
+            table.iloc[0, table.columns.get_loc('parent')] = ''
+            top = self.hierarchy.levels[node]
+        if depth is not None:
+            table = table[self.hierarchy.levels[table.index] < top + depth]
+        return table
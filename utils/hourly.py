@@ -0,0 +1,55 @@
+"""Question/answer activity by UTC time bucket, rotated into any timezone.
+
+Counts are stored once per 15-minute UTC bucket (every real-world UTC offset
+is a multiple of 15 minutes). Switching timezone only converts the distinct
+bucket timestamps and re-bins their counts into 24 hours and a 7 x 24
+weekday grid, so each bucket gets the offset that applied on its own date
+(DST included) rather than today's offset.
+"""
+import numpy as np
+import pandas as pd
+
+BUCKET = '15min'
+DAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+def _bucket_counts(timestamps):
+    timestamps = pd.Series(timestamps).dropna()
+    if timestamps.dt.tz is None:
+        timestamps = timestamps.dt.tz_localize('UTC')
+    return timestamps.dt.tz_convert('UTC').dt.floor(BUCKET).value_counts()
+
+
+class HourlyActivity:
+    def __init__(self, asked, answered):
+        counts = pd.concat({'asked': _bucket_counts(asked), 'answered': _bucket_counts(answered)}, axis=1)
+        counts = counts.fillna(0).astype('int64').sort_index()
+        self.buckets = pd.DatetimeIndex(counts.index)
+        self.counts = counts
+        self._local = {}
+
+    @classmethod
+    def from_frame(cls, frame):
+        return cls(frame['Asked Date'], frame['Highest Score Answer Date'])
+
+    def _grid(self, tz):
+        if tz not in self._local:
+            local = self.buckets.tz_convert(tz)
+            slot = local.dayofweek.to_numpy() * 24 + local.hour.to_numpy()
+            self._local[tz] = {
+                name: np.bincount(slot, weights=self.counts[name].to_numpy(), minlength=7 * 24).reshape(7, 24).astype('int64')
+                for name in self.counts.columns
+            }
+        return self._local[tz]
+
+    def heatmap(self, tz, kind='asked'):
+        """7 x 24 frame of counts, Monday first, in local time."""
+        return pd.DataFrame(self._grid(tz)[kind], index=DAY_ORDER, columns=range(24))
+
+    def by_hour(self, tz):
+        """Asked and answered counts for each local hour of the day."""
+        grid = self._grid(tz)
+        return pd.DataFrame(
+            {'Asked Frequency': grid['asked'].sum(axis=0), 'Answered Frequency': grid['answered'].sum(axis=0)},
+            index=pd.RangeIndex(24, name='Local Hour'),
+        )
@@ -0,0 +1,58 @@
+"""Sparse question x item incidence index.
+
+One CSR matrix per list column (functions, categories, concepts, industries)
+with an interned vocabulary. Frequencies and co-occurrence become column
+sums and sparse products over it, so nothing has to ``explode()`` the
+question frame.
+"""
+import numpy as np
+import pandas as pd
+from scipy import sparse
+
+
+class Incidence:
+    def __init__(self, matrix, vocabulary):
+        self.matrix = matrix.tocsr()
+        self.vocabulary = np.asarray(vocabulary, dtype=object)
+        self._codes = {name: code for code, name in enumerate(self.vocabulary)}
+
+    @classmethod
+    def from_list_column(cls, lists):
+        """Build from a `ListColumn`; an item listed twice in one question counts once."""
+        vocabulary, codes = np.unique(lists.values.astype(str), return_inverse=True)
+        rows = np.repeat(np.arange(len(lists)), lists.lengths())
+        matrix = sparse.csr_matrix(
+            (np.ones(len(codes), dtype=np.int32), (rows, codes.ravel())),
+            shape=(len(lists), len(vocabulary)),
+        )
+        matrix.sum_duplicates()
+        matrix.data[:] = 1
+        return cls(matrix, vocabulary.astype(object))
+
+    @property
+    def shape(self):
+        return self.matrix.shape
+
+    def code(self, name):
+        return self._codes.get(name)
+
+    def _series(self, values, name):
+        counts = pd.Series(np.asarray(values).ravel(), index=pd.Index(self.vocabulary, name=name), name='Counts')
+        return counts[counts > 0].sort_values(ascending=False, kind='stable')
+
+    def counts(self, rows=None, name=None):
+        """Number of questions per item, optionally over a row mask or row indices."""
+        matrix = self.matrix if rows is None else self.matrix[rows]
+        return self._series(matrix.sum(axis=0), name)
+
+    def rows_with(self, name):
+        """Positions of the questions that mention `name`."""
+        code = self.code(name)
+        if code is None:
+            return np.empty(0, dtype=np.int64)
+        return self.matrix[:, code].nonzero()[0]
+
+    def cooccurrence(self):
+        """Item x item matrix of shared questions; the diagonal holds item counts."""
+        matrix = self.matrix.astype(np.int64)
+        return (matrix.T @ matrix).tocsr()
@@ -0,0 +1,290 @@
+"""Offline ingest: turn a raw Stack Overflow dump into the typed dataset the pages read.
+
+    python -m utils.ingest [source] [--output data/dataset]
+    python -m utils.ingest new_questions.parquet --append
+
+All cleaning (numeric views/votes/answers, UTC timestamps, list columns) happens
+here once, so the dashboard never re-parses strings at page load. The DAX code
+is tokenized into the `CODE_COLUMNS` lists over `--jobs` processes; a dump
+without 'DAX Functions in Question' gets it from the parsed calls, and one
+with it is checked against them and against the categories file. The result
+is stored per month (see `utils.partitions`); `--append` merges a new batch,
+replacing questions already stored under the same question ID (or URL), and
+rewrites only the months the batch touches.
+"""
+import argparse
+import hashlib
+import json
+import sys
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from utils.categories import function_categories
+from utils.cooccurrence import monthly_pair_tables
+from utils.cube import author_pairs, build_cube
+from utils.dataset import Dataset
+from utils.dax_tokenizer import extract
+from utils.dtypes import to_frame
+from utils.kpis import monthly_tables
+from utils.list_parser import ListColumn, parse_list_column
+from utils.partitions import TOP_K, PartitionStore, month_labels
+from utils.postings import monthly_top_tables
+from utils.search import term_table
+from utils.schema import (
+    CODE_COLUMNS,
+    CODE_SOURCE_COLUMNS,
+    COUNT_COLUMNS,
+    DATASET_PATH,
+    DATE_COLUMNS,
+    DIMENSIONS,
+    LIST_COLUMNS,
+    SCHEMA_VERSION,
+    SOURCE_PATH,
+)
+
+MISSING_DIFFICULTY = {'': None, 'NA': None, 'none': None}
+
+
+def read_source(path):
+    path = Path(path)
+    if path.suffix == '.csv':
+        return pd.read_csv(path)
+    return pd.read_parquet(path)
+
+
+def file_digest(path):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            digest.update(block)
+    return digest.hexdigest()[:16]
+
+
+def clean(df, jobs=None):
+    df = df.reset_index(drop=True)
+    malformed = {}
+
+    for column in DATE_COLUMNS:
+        if column in df:
+            df[column] = pd.to_datetime(df[column], errors='coerce', utc=True)
+
+    if 'Views' in df and not pd.api.types.is_numeric_dtype(df['Views']):
+        df['Views'] = df['Views'].astype('string').str.replace(r'[^0-9]', '', regex=True)
+    for column in COUNT_COLUMNS:
+        if column in df:
+            df[column] = pd.to_numeric(df[column], errors='coerce').astype('Int64')
+
+    for column in LIST_COLUMNS:
+        if column in df:
+            parsed = parse_list_column(df[column])
+            df[column] = pd.Series(pd.arrays.ArrowExtensionArray(parsed.to_arrow()), index=df.index)
+            if len(parsed.malformed):
+                malformed[column] = parsed.malformed
+
+    code = [df[column] for column in CODE_SOURCE_COLUMNS if column in df]
+    if code:
+        for column, parsed in extract(*code, jobs=jobs).items():
+            df[column] = pd.Series(pd.arrays.ArrowExtensionArray(parsed.to_arrow()), index=df.index)
+        if 'DAX Functions in Question' not in df:
+            df['DAX Functions in Question'] = df['code_functions']
+
+    if 'difficulty_level' in df:
+        df['difficulty_level'] = df['difficulty_level'].replace(MISSING_DIFFICULTY)
+
+    if 'URL' in df:
+        question_id = df['URL'].astype('string').str.extract(r'/questions/(\d+)', expand=False)
+        df['question_id'] = pd.to_numeric(question_id, errors='coerce').astype('Int64')
+
+    return df, malformed
+
+
+def report_malformed(malformed, df, limit=5):
+    for column, rows in malformed.items():
+        sample = df['URL'].iloc[rows[:limit]].tolist() if 'URL' in df else rows[:limit].tolist()
+        print(f'{column}: {len(rows)} malformed rows stored as empty lists, e.g. {sample}', file=sys.stderr)
+
+
+def _pairs(lists):
+    # (row, upper-cased item) per list item.
+    rows = np.repeat(np.arange(len(lists)), lists.lengths())
+    return pd.MultiIndex.from_arrays([rows, pd.Series(lists.values, dtype=object).str.upper()])
+
+
+def report_functions(df, limit=5):
+    """Compare the dump's function lists with the calls in the code and with the categories file."""
+    if 'code_functions' not in df or 'DAX Functions in Question' not in df:
+        return
+    listed = ListColumn.from_series(df['DAX Functions in Question'])
+    called = ListColumn.from_series(df['code_functions'])
+    # Questions without any call in their code can't be checked.
+    checked = called.lengths() > 0
+    listed_pairs, called_pairs = _pairs(listed), _pairs(called)
+    listed_pairs = listed_pairs[checked[listed_pairs.get_level_values(0)]]
+    for pairs, others, message in [
+        (listed_pairs, called_pairs, 'list functions their code never calls'),
+        (called_pairs, listed_pairs, 'call functions missing from their list'),
+    ]:
+        rows = np.unique(pairs[~pairs.isin(others)].get_level_values(0))
+        if len(rows):
+            sample = df['URL'].iloc[rows[:limit]].tolist() if 'URL' in df else rows[:limit].tolist()
+            print(f'DAX Functions in Question: {len(rows)} questions {message}, e.g. {sample}', file=sys.stderr)
+    known = set(function_categories().functions)
+    for column, pairs in [('DAX Functions in Question', _pairs(listed)), ('code_functions', called_pairs)]:
+        unknown = pd.Series(pairs.get_level_values(1)).value_counts()
+        unknown = unknown[~unknown.index.isin(known)]
+        if len(unknown):
+            print(f'{column}: {len(unknown)} functions not in the categories file, e.g. {unknown.index[:limit].tolist()}', file=sys.stderr)
+
+
+def column_type(name, inferred):
+    if name in LIST_COLUMNS or name in CODE_COLUMNS:
+        return pa.list_(pa.string())
+    if name in DATE_COLUMNS:
+        return pa.timestamp('us', tz='UTC')
+    if name in COUNT_COLUMNS or name == 'question_id':
+        return pa.int64()
+    return inferred
+
+
+def to_table(df):
+    table = pa.Table.from_pandas(df, preserve_index=False)
+    schema = pa.schema([pa.field(f.name, column_type(f.name, f.type)) for f in table.schema])
+    return table.cast(schema)
+
+
+def question_keys(df):
+    """Identity used for de-duplication: the question ID, or the URL when it has none."""
+    return df['question_id'].astype('string').fillna(df['URL'].astype('string'))
+
+
+def dedupe(df):
+    # Later rows win, so a dump listing a question twice keeps its latest state.
+    return df[~question_keys(df).duplicated(keep='last')].reset_index(drop=True)
+
+
+def aggregate_months(table, months):
+    """Aggregate partitions (see `utils.partitions`) for every month in `table`, in one pass.
+
+    Each frame has a 'month' column to split it by.
+    """
+    dataset = Dataset(to_frame(table))
+    incidence = dataset.incidence(DIMENSIONS['function'])
+    views = dataset.column('Views').astype('float64').to_numpy(na_value=np.nan)
+    cube = build_cube(dataset, grains=['month']).drop(columns='grain')
+    authors = author_pairs(dataset)
+    kpis, kpi_counts = monthly_tables(dataset.frame(), months)
+    return {
+        'cube': cube.assign(month=month_labels(cube['period'])),
+        'authors': authors.assign(month=month_labels(authors['period'])),
+        'cooccurrence': monthly_pair_tables(incidence, months),
+        'top': monthly_top_tables(incidence, views, months, TOP_K),
+        'kpis': kpis,
+        'kpi_counts': kpi_counts,
+        'terms': term_table(dataset.frame(), months),
+    }
+
+
+def write_months(store, table):
+    """Write `table` as the complete contents of every month it covers."""
+    table = table.sort_by([('Asked Date', 'ascending'), ('question_id', 'ascending')])
+    months = month_labels(table['Asked Date'].to_pandas())
+    frames = aggregate_months(table, months)
+    groups = {kind: dict(tuple(frame.groupby('month'))) for kind, frame in frames.items()}
+    labels, starts, sizes = np.unique(months, return_index=True, return_counts=True)
+    for month, start, size in zip(labels, starts, sizes):
+        store.write_month(month, table.slice(start, size), {
+            kind: groups[kind].get(month, frame.iloc[0:0]) for kind, frame in frames.items()
+        })
+
+
+def _source_entry(source, rows):
+    return {'source': Path(source).name, 'digest': file_digest(source), 'rows': rows}
+
+
+def _now():
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+def _malformed_counts(malformed, previous=None):
+    counts = dict(previous or {})
+    for column, rows in malformed.items():
+        counts[column] = counts.get(column, 0) + len(rows)
+    return counts
+
+
+def ingest(source=SOURCE_PATH, output=DATASET_PATH, jobs=None):
+    """Rebuild the whole dataset from one dump."""
+    df, malformed = clean(read_source(source), jobs)
+    report_malformed(malformed, df)
+    report_functions(df)
+    df = dedupe(df)
+
+    store = PartitionStore(output)
+    for month in store.months:
+        store.drop_month(month)
+    write_months(store, to_table(df))
+    store.commit(
+        schema_version=SCHEMA_VERSION,
+        sources=[_source_entry(source, len(df))],
+        created_at=_now(),
+        updated_at=_now(),
+        malformed_rows=_malformed_counts(malformed),
+    )
+    return store.metadata
+
+
+def append(source, output=DATASET_PATH, jobs=None):
+    """Merge a batch of new or updated questions, touching only the affected months."""
+    store = PartitionStore(output)
+    if not store.months:
+        return ingest(source, output, jobs)
+    if store.metadata.get('schema_version') != SCHEMA_VERSION:
+        raise ValueError(f'{output} was written with schema version {store.metadata.get("schema_version")}; run a full ingest first')
+    batch, malformed = clean(read_source(source), jobs)
+    report_malformed(malformed, batch)
+    report_functions(batch)
+    batch = dedupe(batch)
+    keys = question_keys(batch)
+
+    # A question whose Asked Date was corrected lives in another month; the
+    # ID column is small enough to check every month for those.
+    affected = set(month_labels(batch['Asked Date']))
+    ids = pa.array(batch['question_id'].dropna().to_numpy(dtype=np.int64))
+    for month in store.months:
+        if month not in affected and pc.any(pc.is_in(store.read_month(month, ['question_id'])['question_id'], ids)).as_py():
+            affected.add(month)
+
+    kept, replaced = [], 0
+    for month in sorted(affected & set(store.months)):
+        stored = store.read_month_with_text(month)
+        keep = ~question_keys(stored.select(['question_id', 'URL']).to_pandas()).isin(keys).to_numpy()
+        replaced += int((~keep).sum())
+        kept.append(stored.filter(pa.array(keep)))
+        store.drop_month(month)
+    write_months(store, pa.concat_tables([*kept, to_table(batch)], promote_options='permissive'))
+    store.commit(
+        sources=store.manifest.get('sources', []) + [_source_entry(source, len(batch))],
+        updated_at=_now(),
+        malformed_rows=_malformed_counts(malformed, store.manifest.get('malformed_rows')),
+    )
+    return {'added': len(batch) - replaced, 'replaced': replaced, 'months': sorted(affected), **store.metadata}
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build the typed DAX questions dataset.')
+    parser.add_argument('source', nargs='?', default=SOURCE_PATH, help='raw dump (.parquet or .csv)')
+    parser.add_argument('--output', default=DATASET_PATH)
+    parser.add_argument('--append', action='store_true', help='merge the source into the existing dataset')
+    parser.add_argument('--jobs', type=int, default=None, help='processes for tokenizing the DAX code (default: all CPUs)')
+    args = parser.parse_args(argv)
+    result = (append if args.append else ingest)(args.source, args.output, args.jobs)
+    print(json.dumps(result, indent=2))
+
+
+if __name__ == '__main__':
+    main()
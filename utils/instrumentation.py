@@ -0,0 +1,183 @@
+"""Named timing spans for dashboard reruns.
+
+Pages wrap each section in ``with span('Toughest Puzzles'):``; nested spans
+(dataset load, index builds, chart serialization) are recorded with their
+parent path. A `RunRecorder` collects the spans of one script run, and
+finished runs are kept in a bounded process-wide history that can be
+exported as JSON lines or a Prometheus textfile.
+
+Spans are no-ops when no recorder is active, so library code can be
+instrumented unconditionally and still be used from scripts. While
+tracemalloc is tracing (the headless benchmarks turn it on), each span also
+records its peak traced memory.
+"""
+import contextvars
+import json
+import os
+import tempfile
+import threading
+import time
+import tracemalloc
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+
+_recorder = contextvars.ContextVar('dax_run_recorder', default=None)
+
+
+@dataclass
+class Span:
+    name: str
+    path: str
+    start: float
+    seconds: float = 0.0
+    peak_bytes: int = None
+    attrs: dict = field(default_factory=dict)
+
+
+class RunRecorder:
+    def __init__(self, page, run_id=None):
+        self.page = page
+        self.run_id = run_id or f'{time.time():.6f}'
+        self.started = time.perf_counter()
+        self.wall_clock = time.time()
+        self.spans = []
+        self.seconds = 0.0
+        self._stack = []
+
+    def records(self):
+        for s in self.spans:
+            yield {'page': self.page, 'run_id': self.run_id, 'time': self.wall_clock, **asdict(s)}
+
+
+def current_recorder():
+    return _recorder.get()
+
+
+# tracemalloc keeps a single peak; each open window is [traced bytes at its
+# start, highest peak seen], updated whenever a nested window resets the peak.
+_windows = []
+_windows_lock = threading.Lock()
+
+
+def _open_window():
+    with _windows_lock:
+        current, peak = tracemalloc.get_traced_memory()
+        for window in _windows:
+            window[1] = max(window[1], peak)
+        tracemalloc.reset_peak()
+        window = [current, current]
+        _windows.append(window)
+        return window
+
+
+def _close_window(window):
+    with _windows_lock:
+        peak = tracemalloc.get_traced_memory()[1]
+        _windows.remove(window)
+        for open_window in [window, *_windows]:
+            open_window[1] = max(open_window[1], peak)
+        return window[1] - window[0]
+
+
+@contextmanager
+def peak_memory():
+    """Peak traced memory above the starting level, in the yielded dict's 'bytes' once the block exits.
+
+    Nested blocks (and spans) each get their own peak. Needs tracemalloc to be tracing.
+    """
+    window, result = _open_window(), {}
+    try:
+        yield result
+    finally:
+        result['bytes'] = _close_window(window)
+
+
+@contextmanager
+def span(name, **attrs):
+    recorder = _recorder.get()
+    if recorder is None:
+        yield None
+        return
+    path = '/'.join([*recorder._stack, name])
+    record = Span(name, path, time.perf_counter() - recorder.started, attrs=attrs)
+    recorder._stack.append(name)
+    window = _open_window() if tracemalloc.is_tracing() else None
+    started = time.perf_counter()
+    try:
+        yield record
+    finally:
+        record.seconds = time.perf_counter() - started
+        if window is not None:
+            record.peak_bytes = _close_window(window)
+        recorder._stack.pop()
+        recorder.spans.append(record)
+
+
+class History:
+    """Bounded record of finished runs plus running per-section totals."""
+
+    def __init__(self, maxlen=500):
+        self.runs = deque(maxlen=maxlen)
+        self.totals = {}
+        self._lock = threading.Lock()
+
+    def add(self, recorder):
+        with self._lock:
+            self.runs.append(recorder)
+            for s in recorder.spans:
+                key = (recorder.page, s.path)
+                count, total = self.totals.get(key, (0, 0.0))
+                self.totals[key] = (count + 1, total + s.seconds)
+            count, total = self.totals.get((recorder.page, ''), (0, 0.0))
+            self.totals[(recorder.page, '')] = (count + 1, total + recorder.seconds)
+
+    def prometheus(self):
+        lines = [
+            '# HELP dax_section_seconds Time spent in dashboard sections.',
+            '# TYPE dax_section_seconds summary',
+        ]
+        with self._lock:
+            totals = sorted(self.totals.items())
+        for (page, path), (count, total) in totals:
+            labels = f'page="{_escape(page)}",section="{_escape(path or "(rerun)")}"'
+            lines.append(f'dax_section_seconds_sum{{{labels}}} {total:.6f}')
+            lines.append(f'dax_section_seconds_count{{{labels}}} {count}')
+        return '\n'.join(lines) + '\n'
+
+
+def _escape(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+HISTORY = History()
+
+
+@contextmanager
+def record_run(page, run_id=None, history=HISTORY):
+    recorder = RunRecorder(page, run_id)
+    token = _recorder.set(recorder)
+    try:
+        yield recorder
+    finally:
+        recorder.seconds = time.perf_counter() - recorder.started
+        _recorder.reset(token)
+        history.add(recorder)
+
+
+def to_jsonl(recorders):
+    return ''.join(json.dumps(record) + '\n' for recorder in recorders for record in recorder.records())
+
+
+def append_jsonl(path, recorder):
+    with open(path, 'a') as f:
+        f.write(to_jsonl([recorder]))
+
+
+def write_textfile(path, history=HISTORY, extra=''):
+    """Section totals plus any `extra` Prometheus lines."""
+    # Write-then-rename so the node exporter never reads a half-written file.
+    directory = os.path.dirname(os.path.abspath(path))
+    with tempfile.NamedTemporaryFile('w', dir=directory, delete=False, suffix='.tmp') as f:
+        f.write(history.prometheus() + extra)
+    os.replace(f.name, path)
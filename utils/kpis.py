@@ -0,0 +1,108 @@
+"""Headline numbers for the overview from mergeable summaries.
+
+A `KpiSummary` keeps only what the overview's cards and insights need: per
+measure sums, counts and extremes, the first and last Asked Date, questions
+per answer count and questions per top-answer author. Summaries of separate
+months merge exactly, so ingest writes one per month partition and loading
+the dataset only combines those small tables; the numbers themselves then
+come from the summary, not from the questions.
+"""
+from functools import cached_property
+
+import pandas as pd
+
+AUTHOR = 'Highest Score Answer Author'
+ANONYMOUS = 'Anonymous'
+ANSWERS = 'Number of Answers'
+MEASURES = {'views': 'Views', 'votes': 'Votes', 'answers': ANSWERS}
+STATISTICS = ['sum', 'count', 'min', 'max']
+
+
+def monthly_tables(frame, months):
+    """Summary tables for every month in one grouped pass, each with a 'month' column.
+
+    Returns the scalar rows (one per month) and the answer-count and author
+    histograms as (month, stat, key, questions) rows.
+    """
+    months = pd.Series(months, index=frame.index, name='month', dtype=object)
+    aggregations = {
+        'questions': ('Asked Date', 'size'),
+        'first_asked': ('Asked Date', 'min'),
+        'last_asked': ('Asked Date', 'max'),
+    }
+    for name, column in MEASURES.items():
+        aggregations.update({f'{name}_{stat}': (column, stat) for stat in STATISTICS})
+    # Sums of narrow (int32) counts must not wrap around.
+    measures = frame[['Asked Date', *MEASURES.values()]].astype({column: 'Int64' for column in MEASURES.values()})
+    scalars = measures.groupby(months).agg(**aggregations).reset_index()
+
+    answers = frame[ANSWERS].groupby(months).value_counts().rename_axis(['month', 'key']).reset_index(name='questions')
+    answers['key'] = answers['key'].astype('int64').astype(str)
+    authors = frame[AUTHOR].groupby(months).value_counts().rename_axis(['month', 'key']).reset_index(name='questions')
+    authors['key'] = authors['key'].astype(str)
+    counts = pd.concat([answers.assign(stat='answers'), authors.assign(stat='author')], ignore_index=True)
+    # Categorical columns also count the values a month doesn't have.
+    counts = counts[counts['questions'] > 0].astype({'questions': 'int64'})
+    return scalars, counts[['month', 'stat', 'key', 'questions']].reset_index(drop=True)
+
+
+class KpiSummary:
+    def __init__(self, totals, answers, authors):
+        self.totals = totals
+        self.answers = answers
+        self.authors = authors
+
+    @classmethod
+    def from_frame(cls, frame):
+        return cls.from_tables(*monthly_tables(frame, ''))
+
+    @classmethod
+    def from_tables(cls, scalars, counts):
+        """Merge per-month `monthly_tables` output."""
+        totals = {
+            'questions': scalars['questions'].sum(),
+            'first_asked': scalars['first_asked'].min(),
+            'last_asked': scalars['last_asked'].max(),
+        }
+        for name in MEASURES:
+            for stat in STATISTICS:
+                column = scalars[f'{name}_{stat}']
+                totals[f'{name}_{stat}'] = column.sum() if stat in ('sum', 'count') else getattr(column, stat)()
+        merged = counts.groupby(['stat', 'key'])['questions'].sum()
+        answers = merged.get('answers', pd.Series(dtype='int64'))
+        answers.index = answers.index.astype('int64')
+        return cls(totals, answers.sort_index(), merged.get('author', pd.Series(dtype='int64')))
+
+    def _mean(self, name):
+        count = self.totals[f'{name}_count']
+        return self.totals[f'{name}_sum'] / count if count else None
+
+    @cached_property
+    def stats(self):
+        """The overview numbers as a flat dict (see `utils.analytics.kpis`), worked out once."""
+        totals = self.totals
+        experts = self.authors.drop(ANONYMOUS, errors='ignore')
+        # Most answers first; ties go to the alphabetically first author.
+        experts = experts.sort_index().sort_values(ascending=False, kind='stable')
+        answers = self.answers
+        return {
+            'questions': totals['questions'],
+            'first_asked': totals['first_asked'],
+            'last_asked': totals['last_asked'],
+            'views': totals['views_sum'],
+            'views_mean': self._mean('views'),
+            'views_max': totals['views_max'],
+            'votes': totals['votes_sum'],
+            'votes_min': totals['votes_min'],
+            'votes_mean': self._mean('votes'),
+            'votes_max': totals['votes_max'],
+            'answers': totals['answers_sum'],
+            'answers_mean': self._mean('answers'),
+            'answers_max': totals['answers_max'],
+            # Like Series.mode(): the smallest of the most common answer counts.
+            'answers_mode': answers[answers == answers.max()].index.min() if len(answers) else None,
+            'contributors': len(self.authors),
+            'experts': len(experts),
+            'top_contributor': experts.index[0] if len(experts) else None,
+            'top_contributor_answers': experts.iloc[0] if len(experts) else 0,
+        }
@@ -0,0 +1,108 @@
+"""Batched parser for the stringified Python lists in the raw dump.
+
+Columns such as ``DAX Functions in Question`` arrive as ``"['SUM', 'FILTER']"``.
+Instead of calling ``ast.literal_eval`` row by row, a whole column is validated
+and tokenized in a couple of vectorized passes and returned as offset + value
+buffers, which map directly onto an Arrow ``list<string>`` array.
+"""
+import ast
+import re
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+_ITEM = r"""'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*\""""
+# ``None`` items are accepted and dropped: only quoted items are extracted.
+_ELEMENT = rf"(?:{_ITEM}|None)"
+_LIST = rf"^\s*\[\s*(?:{_ELEMENT}\s*(?:,\s*{_ELEMENT}\s*)*,?\s*)?\]\s*$"
+
+ITEM_PATTERN = re.compile(_ITEM)
+
+
+@dataclass(frozen=True)
+class ListColumn:
+    offsets: np.ndarray
+    values: np.ndarray
+    malformed: np.ndarray
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    @classmethod
+    def from_sequences(cls, values):
+        values = [[item for item in v if item is not None] if isinstance(v, (list, tuple, np.ndarray)) else [] for v in values]
+        lengths = np.fromiter((len(v) for v in values), dtype=np.int64, count=len(values))
+        offsets = np.zeros(len(values) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        flat = np.concatenate([np.asarray(v, dtype=object) for v in values]) if offsets[-1] else np.empty(0, dtype=object)
+        return cls(offsets, flat.astype(str).astype(object), np.empty(0, dtype=np.int64))
+
+    @classmethod
+    def from_series(cls, series):
+        """From a frame column: Arrow-backed list columns are read without a Python loop."""
+        if isinstance(series.dtype, pd.ArrowDtype) and pa.types.is_list(series.dtype.pyarrow_dtype):
+            array = pa.array(series.array)
+            offsets = np.zeros(len(array) + 1, dtype=np.int64)
+            np.cumsum(pc.list_value_length(array).fill_null(0).to_numpy(), out=offsets[1:])
+            values = array.flatten()
+            if pa.types.is_dictionary(values.type):
+                values = values.dictionary.to_numpy(zero_copy_only=False)[values.indices.to_numpy(zero_copy_only=False)]
+            else:
+                values = values.to_numpy(zero_copy_only=False)
+            return cls(offsets, np.asarray(values, dtype=object), np.empty(0, dtype=np.int64))
+        return cls.from_sequences(series)
+
+    def lengths(self):
+        return np.diff(self.offsets)
+
+    def to_arrow(self):
+        offsets = pa.array(self.offsets, type=pa.int32())
+        return pa.ListArray.from_arrays(offsets, pa.array(self.values, type=pa.string()))
+
+
+def _strip_quotes(tokens):
+    tokens = pa.array(tokens, type=pa.string())
+    values = pc.utf8_slice_codeunits(tokens, 1, -1).to_numpy(zero_copy_only=False)
+    escaped = np.flatnonzero(pc.match_substring(tokens, '\\').to_numpy(zero_copy_only=False))
+    for i in escaped:
+        values[i] = ast.literal_eval(tokens[i].as_py())
+    return values
+
+
+def parse_list_column(values):
+    """Parse a column of stringified lists.
+
+    Missing values become empty lists and ``None`` items are dropped. Rows
+    that are not a list of string literals also become empty lists, but their
+    positions are reported in ``ListColumn.malformed`` rather than being
+    silently dropped.
+    """
+    values = pd.Series(values).reset_index(drop=True)
+    non_null = values.dropna()
+    if len(non_null) and isinstance(non_null.iloc[0], (list, tuple, np.ndarray)):
+        return ListColumn.from_sequences(values)
+
+    strings = pa.array(values.astype('string').fillna('[]'), type=pa.string())
+    if isinstance(strings, pa.ChunkedArray):
+        # Arrow-backed string columns convert to chunked arrays.
+        strings = strings.combine_chunks()
+    valid = pc.match_substring_regex(strings, _LIST).to_numpy(zero_copy_only=False)
+    malformed = np.flatnonzero(~valid)
+
+    strings = pc.if_else(pa.array(valid), strings, '[]')
+    counts = pc.count_substring_regex(strings, _ITEM).to_numpy(zero_copy_only=False).astype(np.int64)
+    offsets = np.zeros(len(values) + 1, dtype=np.int64)
+    np.cumsum(counts, out=offsets[1:])
+
+    # Every row is now a well-formed list, so quotes are balanced and a single
+    # scan over the concatenated text yields each item in row order.
+    rows = pa.ListArray.from_arrays(pa.array([0, len(strings)], type=pa.int32()), strings)
+    blob = pc.binary_join(rows, '\n')[0].as_py() or ''
+    items = _strip_quotes(ITEM_PATTERN.findall(blob))
+    if len(items) != offsets[-1]:
+        raise ValueError(f'list parser desynchronised: expected {offsets[-1]} items, found {len(items)}')
+
+    return ListColumn(offsets, items.astype(object), malformed)
@@ -0,0 +1,155 @@
+"""Month-partitioned storage for the ingested dataset.
+
+    data/dataset/
+        manifest.json                          versions and row counts per month
+        questions/2023-01-<version>.parquet    that month's questions, by Asked Date
+        text/2023-01-<version>.arrow           their long text (see `utils.text_store`)
+        aggregates/<kind>/2023-01-<version>.parquet
+
+Every month carries its own aggregate partitions (cube rows, co-occurrence
+pair counts, top-viewed questions, KPI summaries, search terms), so an append only rewrites and
+re-aggregates the months it touches, and readers combine the small
+per-month aggregates instead of rescanning every question. File names carry
+the month's content version and the manifest is replaced atomically, so a
+reader always sees one consistent set of partitions. A commit keeps the
+files of the manifest it replaces, so a dataset loaded just before an append
+can still read its partitions lazily; older versions are deleted.
+"""
+import hashlib
+import json
+import os
+import tempfile
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+import pyarrow.parquet as pq
+
+from utils.schema import TEXT_COLUMNS
+from utils.text_store import encode_text, read_text
+
+MANIFEST = 'manifest.json'
+AGGREGATES = ['cube', 'authors', 'cooccurrence', 'top', 'kpis', 'kpi_counts', 'terms']
+UNDATED = 'undated'
+# Top-viewed questions kept per function and month; the pages ask for at most 20.
+TOP_K = 20
+# Rows are sorted by Asked Date within a month, so each row group covers a
+# narrow date span and date filters can skip most of a busy month.
+ROW_GROUP_SIZE = 4096
+
+
+def month_labels(asked):
+    """'YYYY-MM' partition label for each Asked Date; missing dates go to 'undated'."""
+    asked = pd.Series(asked)
+    if asked.dt.tz is not None:
+        asked = asked.dt.tz_convert(None)
+    months = asked.to_numpy(dtype='datetime64[ns]').astype('datetime64[M]')
+    labels = np.datetime_as_string(months, unit='M').astype(object)
+    labels[np.isnat(months)] = UNDATED
+    return labels
+
+
+def _write_atomic(path, write):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=path.parent, suffix='.tmp')
+    os.close(fd)
+    try:
+        write(tmp)
+        os.replace(tmp, path)
+    except BaseException:
+        os.unlink(tmp)
+        raise
+
+
+class PartitionStore:
+    def __init__(self, root):
+        self.root = Path(root)
+        self.manifest_path = self.root / MANIFEST
+        self.manifest = json.loads(self.manifest_path.read_text()) if self.manifest_path.exists() else {'months': {}}
+
+    @property
+    def months(self):
+        return sorted(self.manifest['months'])
+
+    @property
+    def metadata(self):
+        return {key: value for key, value in self.manifest.items() if key != 'months'}
+
+    def rows(self, month):
+        return self.manifest['months'][month]['rows']
+
+    def offsets(self):
+        """Position of each month's first row in the concatenated dataset."""
+        offsets, total = {}, 0
+        for month in self.months:
+            offsets[month] = total
+            total += self.rows(month)
+        return offsets
+
+    def path(self, kind, month, version=None):
+        version = version or self.manifest['months'][month]['version']
+        if kind == 'text':
+            return self.root / 'text' / f'{month}-{version}.arrow'
+        folder = self.root / 'questions' if kind == 'questions' else self.root / 'aggregates' / kind
+        return folder / f'{month}-{version}.parquet'
+
+    def read_month(self, month, columns=None, filter=None):
+        """`filter` is a pyarrow expression checked against row-group statistics first."""
+        return pq.read_table(self.path('questions', month), columns=columns, filters=filter)
+
+    def read_month_with_text(self, month):
+        """A month's questions with their text columns joined back on."""
+        table = self.read_month(month)
+        text = read_text(self.path('text', month))
+        for column in TEXT_COLUMNS:
+            table = table.append_column(column, text[column])
+        return table
+
+    def read(self, columns=None, months=None, filter=None):
+        tables = [self.read_month(month, columns, filter) for month in (self.months if months is None else months)]
+        return pa.concat_tables(tables) if tables else None
+
+    def read_aggregate(self, kind):
+        """One aggregate kind across every month; rows carry their 'month'."""
+        if not self.months:
+            return pd.DataFrame()
+        # One multi-file scan reads the partitions in parallel.
+        paths = [str(self.path(kind, month)) for month in self.months]
+        return ds.dataset(paths, format='parquet').to_table().to_pandas()
+
+    def write_month(self, month, table, aggregates):
+        """Write a month's questions, text and aggregates; takes effect on the next `commit`."""
+        buffer = pa.BufferOutputStream()
+        pq.write_table(table.drop_columns(TEXT_COLUMNS), buffer, compression='zstd', row_group_size=ROW_GROUP_SIZE)
+        data = buffer.getvalue().to_pybytes()
+        text = encode_text(table.select(['question_id', *TEXT_COLUMNS]))
+        version = hashlib.sha256(data + text).hexdigest()[:16]
+        _write_atomic(self.path('questions', month, version), lambda tmp: Path(tmp).write_bytes(data))
+        _write_atomic(self.path('text', month, version), lambda tmp: Path(tmp).write_bytes(text))
+        for kind in AGGREGATES:
+            frame = aggregates[kind]
+            _write_atomic(self.path(kind, month, version), lambda tmp: frame.to_parquet(tmp, index=False, compression='zstd'))
+        self.manifest['months'][month] = {'rows': table.num_rows, 'version': version}
+
+    def drop_month(self, month):
+        self.manifest['months'].pop(month, None)
+
+    def commit(self, **metadata):
+        # Readers that loaded the manifest being replaced may still open its files.
+        previous = json.loads(self.manifest_path.read_text())['months'] if self.manifest_path.exists() else {}
+        months = self.manifest['months']
+        digest = hashlib.sha256(json.dumps(sorted((m, v['version']) for m, v in months.items())).encode())
+        self.manifest.update(metadata, dataset_version=digest.hexdigest()[:16], rows=sum(v['rows'] for v in months.values()))
+        text = json.dumps(self.manifest, indent=2, sort_keys=True)
+        _write_atomic(self.manifest_path, lambda tmp: Path(tmp).write_text(text))
+        self._remove_unreferenced(previous)
+
+    def _remove_unreferenced(self, previous):
+        """Delete files that neither this manifest nor `previous` (month -> entry) references."""
+        versions = {(month, entry['version']) for months in (self.manifest['months'], previous) for month, entry in months.items()}
+        live = {self.path(kind, month, version) for month, version in versions for kind in ['questions', 'text', *AGGREGATES]}
+        for path in [*self.root.glob('**/*.parquet'), *self.root.glob('text/*.arrow')]:
+            if path not in live:
+                path.unlink(missing_ok=True)
@@ -0,0 +1,122 @@
+"""Streamlit side of the instrumentation: per-rerun recording, exports and the debug panel.
+
+The sidebar panel is opt-in: open any page with ``?perf=1`` (or set
+``DAX_PERF_PANEL=1``). Independently of the panel, every rerun's spans can
+be appended to ``$DAX_PERF_JSONL`` and section totals written to the
+Prometheus textfile at ``$DAX_PERF_TEXTFILE``.
+"""
+import cProfile
+import functools
+import io
+import os
+import pstats
+from contextlib import contextmanager, nullcontext
+
+import pandas as pd
+import streamlit as st
+
+from utils.figure_cache import FIGURES
+from utils.figures import compact_figure
+from utils.instrumentation import (
+    HISTORY, append_jsonl, current_recorder, record_run, span, to_jsonl, write_textfile,
+)
+
+PERF_JSONL = os.environ.get('DAX_PERF_JSONL')
+PERF_TEXTFILE = os.environ.get('DAX_PERF_TEXTFILE')
+
+
+def panel_enabled():
+    return st.query_params.get('perf') == '1' or os.environ.get('DAX_PERF_PANEL') == '1'
+
+
+def plotly_chart(fig, **kwargs):
+    """`st.plotly_chart` for a compacted copy of `fig` (see `utils.figures`)."""
+    # Separate spans so payload trimming and serialization show up apart from building the figure.
+    with span('compact chart'):
+        fig = compact_figure(fig)
+    with span('serialize chart'):
+        return st.plotly_chart(fig, **kwargs)
+
+
+def cached_figure(dataset, name, build, params=None):
+    """``build()``, shared through `FIGURES` by every session with the same dataset and ``params``.
+
+    ``params`` must hold every widget value the figure depends on.
+    """
+    with span('figure', chart=name):
+        return FIGURES.get(FIGURES.key(dataset.version, name, params), build)
+
+
+def cached_chart(dataset, name, build, params=None, **kwargs):
+    """`plotly_chart` for a cached figure; the compacted copy is what gets cached."""
+    fig = cached_figure(dataset, name, lambda: compact_figure(build()), params)
+    with span('serialize chart'):
+        return st.plotly_chart(fig, **kwargs)
+
+
+@contextmanager
+def instrumented_run(page):
+    profiler = None
+    if st.session_state.pop('_perf_profile_next', False):
+        profiler = cProfile.Profile()
+
+    with record_run(page) as recorder:
+        if profiler:
+            profiler.enable()
+        try:
+            yield recorder
+        finally:
+            if profiler:
+                profiler.disable()
+
+    if profiler:
+        out = io.StringIO()
+        pstats.Stats(profiler, stream=out).sort_stats('cumulative').print_stats(30)
+        st.session_state['_perf_profile'] = out.getvalue()
+    if PERF_JSONL:
+        append_jsonl(PERF_JSONL, recorder)
+    if PERF_TEXTFILE:
+        write_textfile(PERF_TEXTFILE, extra=FIGURES.prometheus())
+
+
+def section(name):
+    """Run the decorated page section as an `st.fragment` inside a span called ``name``.
+
+    Widgets inside the section then rerun only the section. Those partial
+    reruns happen outside the page's recorder, so they are recorded as runs
+    of their own.
+    """
+    def decorate(func):
+        @functools.wraps(func)
+        def run(*args, **kwargs):
+            outer = instrumented_run(name) if current_recorder() is None else nullcontext()
+            with outer, span(name):
+                return func(*args, **kwargs)
+        return st.fragment(run)
+    return decorate
+
+
+def render_panel(recorder):
+    if not panel_enabled():
+        return
+    with st.sidebar.expander("⏱️ Performance", expanded=True):
+        st.metric("Rerun time", f"{recorder.seconds * 1000:,.0f} ms")
+        spans = pd.DataFrame(
+            [{'Section': s.path, 'ms': round(s.seconds * 1000, 1)} for s in sorted(recorder.spans, key=lambda s: s.start)]
+        )
+        if not spans.empty:
+            st.dataframe(spans, hide_index=True, use_container_width=True)
+
+        st.download_button("Spans (JSON lines)", to_jsonl([recorder]), file_name="spans.jsonl")
+        st.download_button("Section totals (Prometheus)", HISTORY.prometheus() + FIGURES.prometheus(), file_name="dax_sections.prom")
+
+        counts = FIGURES.stats()
+        hits, misses = sum(h for h, _ in counts.values()), sum(m for _, m in counts.values())
+        st.caption(f"Figure cache: {hits} hits, {misses} misses, {len(FIGURES)} figures")
+
+        if st.button("Profile next rerun"):
+            st.session_state['_perf_profile_next'] = True
+            st.rerun()
+        profile = st.session_state.get('_perf_profile')
+        if profile:
+            st.code(profile, language=None)
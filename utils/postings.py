@@ -0,0 +1,82 @@
+"""Inverted item -> question index, pre-sorted by descending views.
+
+Answers "top-k most viewed questions for this function" (or category,
+concept, industry) with an O(k) slice of a posting list instead of scanning
+every question. Built either from the incidence index or by merging the
+per-month top-viewed tables written at ingest, which keep the `TOP_K` most
+viewed questions per item and month.
+"""
+import numpy as np
+import pandas as pd
+
+
+class Postings:
+    def __init__(self, order, indptr, rows, vocabulary):
+        self.order = order
+        self.indptr = indptr
+        self.rows = rows
+        self.vocabulary = np.asarray(vocabulary, dtype=object)
+        self._codes = {name: code for code, name in enumerate(self.vocabulary)}
+
+    @classmethod
+    def from_incidence(cls, incidence, views):
+        views = np.asarray(views, dtype=np.float64)
+        ranked = np.flatnonzero(~np.isnan(views))
+        # Stable sort keeps dataset order between questions with equal views.
+        order = ranked[np.argsort(-views[ranked], kind='stable')]
+        # Reordering rows by rank means every CSC column lists its questions
+        # from most to least viewed.
+        by_rank = incidence.matrix[order].tocsc()
+        by_rank.sort_indices()
+        return cls(order, by_rank.indptr, order[by_rank.indices], incidence.vocabulary)
+
+    @classmethod
+    def from_top_tables(cls, tables, offsets, k):
+        """Merge per-month `top_table()` frames; `offsets` maps month -> first dataset row."""
+        tables = tables.assign(row=tables['row'] + tables['month'].map(offsets))
+        tables = tables.sort_values(['views', 'row'], ascending=[False, True], kind='stable')
+        tables = tables.groupby('item', dropna=False, sort=False).head(k)
+        overall = tables['item'].isna()
+        order = tables.loc[overall, 'row'].to_numpy(dtype=np.int64)
+        items = tables[~overall]
+        vocabulary, codes = np.unique(items['item'].to_numpy(dtype=str), return_inverse=True)
+        by_item = np.argsort(codes, kind='stable')
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=len(vocabulary)))])
+        return cls(order, indptr, items['row'].to_numpy(dtype=np.int64)[by_item], vocabulary.astype(object))
+
+    def top(self, name, k):
+        """Positions of the `k` most viewed questions that mention `name`."""
+        code = self._codes.get(name)
+        if code is None:
+            return np.empty(0, dtype=np.int64)
+        start = self.indptr[code]
+        return self.rows[start:min(start + k, self.indptr[code + 1])]
+
+    def top_overall(self, k):
+        return self.order[:k]
+
+
+def monthly_top_tables(incidence, views, months, k):
+    """Each month's `k` most viewed questions per item as month, item, row, views.
+
+    `item` is None for the month's overall ranking and `row` counts from the
+    month's first question, in dataset order.
+    """
+    views = np.asarray(views, dtype=np.float64)
+    rows, codes = incidence.matrix.nonzero()
+    everything = np.arange(len(views))
+    table = pd.DataFrame({
+        'item': np.concatenate([np.full(len(everything), None, dtype=object), incidence.vocabulary[codes]]),
+        'row': np.concatenate([everything, rows]),
+    })
+    table['views'] = views[table['row']]
+    table = table[table['views'].notna()]
+    table = table.sort_values(['views', 'row'], ascending=[False, True], kind='stable')
+    table = table.groupby([months[table['row']], table['item']], dropna=False, sort=False).head(k)
+
+    # Position of each question within its own month.
+    labels, inverse = np.unique(months, return_inverse=True)
+    sizes = np.bincount(inverse, minlength=len(labels))
+    within = np.empty(len(months), dtype=np.int64)
+    within[np.argsort(inverse, kind='stable')] = np.arange(len(months)) - np.repeat(np.cumsum(sizes) - sizes, sizes)
+    return table.assign(month=months[table['row']], row=within[table['row']])[['month', 'item', 'row', 'views']]
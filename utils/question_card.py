@@ -0,0 +1,37 @@
+"""Question card shared by every page that lists questions."""
+import streamlit as st
+
+
+def render_question(row, heading):
+    """One question (a row with `analytics.QUESTION_COLUMNS`) under a markdown ``### heading``."""
+    st.markdown(f"### {heading}")
+
+    col1, col2, col3, col4 = st.columns([1.5, 1, 0.7, 2])
+
+    with col1:
+        with st.container(border=True):
+            st.markdown(f"**Asked Date:** {row['Asked Date'].strftime('%Y-%m-%d')}")
+
+    with col2:
+        with st.container(border=True):
+            st.markdown(f"**Views:** {format(int(row['Views']), ',')}")
+
+    with col3:
+        with st.container(border=True):
+            st.markdown(f"**Answers:** {row['Number of Answers']}")
+
+    with col4:
+        with st.container(border=True):
+            st.markdown(f"**Concepts**: {', '.join(row['concepts'])}")
+
+    st.write(row['context'])
+
+    if row['dax_code_provided']:
+        st.code(row['dax_code_provided'], language='sql')
+
+    if row['correct_answer']:
+        st.markdown("#### Correct Answer:")
+        st.code(row['correct_answer'], language='sql')
+
+    st.markdown(f"[View original post]({row['URL']})", unsafe_allow_html=True)
+    st.markdown("---")
@@ -0,0 +1,62 @@
+SCHEMA_VERSION = 6
+
+SOURCE_PATH = 'data/data.parquet'
+DATASET_PATH = 'data/dataset'
+
+LIST_COLUMNS = [
+    'DAX Functions in Question',
+    'Categories in Question',
+    'concepts',
+    'industries',
+]
+
+COUNT_COLUMNS = [
+    'Views',
+    'Votes',
+    'Number of Answers',
+    'Highest Score Answer Score',
+]
+
+# Low-cardinality strings held as pandas categoricals once loaded.
+CATEGORICAL_COLUMNS = [
+    'Highest Score Answer Author',
+    'difficulty_level',
+]
+
+DATE_COLUMNS = [
+    'Asked Date',
+    'Modified Date',
+    'Highest Score Answer Date',
+]
+
+# Long text kept out of the question partitions (see `utils.text_store`).
+TEXT_COLUMNS = [
+    'context',
+    'dax_code_provided',
+    'correct_answer',
+]
+
+# Derived at ingest from the DAX code columns (see `utils.dax_tokenizer`):
+# function calls, tables, 'Table[Column]'/'[Measure]' references, VAR names.
+CODE_SOURCE_COLUMNS = [
+    'dax_code_provided',
+    'correct_answer',
+]
+CODE_COLUMNS = [
+    'code_functions',
+    'code_tables',
+    'code_columns',
+    'code_variables',
+]
+
+# Cube dimension -> dataset column. List columns contribute one row per item.
+DIMENSIONS = {
+    'function': 'DAX Functions in Question',
+    'category': 'Categories in Question',
+    'concept': 'concepts',
+    'industry': 'industries',
+    'difficulty': 'difficulty_level',
+}
+
+CATEGORIES_PATH = 'data/dax-categories.json'
+HIERARCHY_PATH = 'data/dax_hierarchy.json'
@@ -0,0 +1,154 @@
+"""Full-text question search: BM25 over an inverted index built at ingest.
+
+A question's document is its context, DAX code and accepted answer. Text is
+lowercased and split on anything but letters, digits, '_' and '.'; a dotted
+token stays whole only if it names a DAX function (``PERCENTILE.INC``,
+``VARX.S``), so function names are single tokens in code and prose alike.
+
+Ingest writes each month's (question_id, term, count) rows as the 'terms'
+aggregate partition. The first search merges them into a term x question
+CSR index, shared by every dataset read from the same store version, and a
+query then only touches the postings of its own terms.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from utils.categories import function_categories
+from utils.schema import TEXT_COLUMNS
+
+# BM25 term-frequency saturation and length normalisation.
+K1 = 1.2
+B = 0.75
+SEPARATORS = r'[^0-9a-z_.]+'
+# Stored indexes kept per process, one per (store, dataset version).
+STORED_INDEXES = 2
+
+
+def _function_names():
+    return pa.array([name.lower() for name in function_categories().functions], type=pa.string())
+
+
+def _flatten(pieces):
+    return pc.list_parent_indices(pieces).to_numpy(), pc.list_flatten(pieces)
+
+
+def tokenize(texts):
+    """Tokens of an array of texts, as (text position, token) arrays."""
+    if isinstance(texts, pa.ChunkedArray):
+        texts = texts.combine_chunks()
+    parents, tokens = _flatten(pc.split_pattern_regex(pc.utf8_lower(texts), SEPARATORS))
+    tokens = pc.utf8_trim(tokens, '.')
+    dotted = pc.and_(pc.match_substring(tokens, '.'), pc.invert(pc.is_in(tokens, value_set=_function_names())))
+    dotted = dotted.to_numpy(zero_copy_only=False)
+    if dotted.any():
+        within, pieces = _flatten(pc.split_pattern(tokens.filter(pa.array(dotted)), '.'))
+        parents = np.concatenate([parents[~dotted], parents[dotted][within]])
+        tokens = pa.concat_arrays([tokens.filter(pa.array(~dotted)), pieces])
+    keep = pc.not_equal(tokens, '').to_numpy(zero_copy_only=False)
+    return parents[keep], tokens.filter(pa.array(keep)).to_numpy(zero_copy_only=False)
+
+
+def query_terms(query):
+    return list(dict.fromkeys(tokenize(pa.array([query], type=pa.string()))[1]))
+
+
+def term_table(frame, months=''):
+    """(month, question_id, term, count) rows for every question with an ID."""
+    parts = [tokenize(pa.array(frame[column], type=pa.string(), from_pandas=True)) for column in TEXT_COLUMNS]
+    rows = np.concatenate([row for row, _ in parts])
+    terms = np.concatenate([tokens for _, tokens in parts])
+    codes, vocabulary = pd.factorize(terms)
+    # One sortable key per (question, term) pair; np.unique then counts them.
+    pairs, counts = np.unique(rows.astype(np.int64) * max(len(vocabulary), 1) + codes, return_counts=True)
+    rows, codes = np.divmod(pairs, max(len(vocabulary), 1))
+    has_id = frame['question_id'].notna().to_numpy()[rows]
+    months = np.broadcast_to(np.asarray(months, dtype=object), (len(frame),))
+    return pd.DataFrame({
+        'month': months[rows[has_id]],
+        'question_id': frame['question_id'].to_numpy(dtype='int64', na_value=0)[rows[has_id]],
+        'term': np.asarray(vocabulary, dtype=object)[codes[has_id]],
+        'count': counts[has_id].astype(np.int32),
+    })
+
+
+class SearchIndex:
+    def __init__(self, vocabulary, indptr, docs, weights, question_ids):
+        self.vocabulary = vocabulary
+        self._codes = {term: code for code, term in enumerate(vocabulary)}
+        # Postings of term t are docs[indptr[t]:indptr[t + 1]], sorted, with
+        # their BM25 term-frequency weights; a query multiplies in the IDF.
+        self.indptr = indptr
+        self.docs = docs
+        self.weights = weights
+        self.question_ids = pd.Index(question_ids)
+
+    @classmethod
+    def from_terms(cls, terms):
+        """Merge `term_table` rows (any number of months)."""
+        question_ids, docs = np.unique(terms['question_id'].to_numpy(dtype=np.int64), return_inverse=True)
+        codes, vocabulary = pd.factorize(terms['term'].to_numpy(dtype=object))
+        counts = terms['count'].to_numpy(dtype=np.float64)
+        lengths = np.bincount(docs, weights=counts, minlength=len(question_ids))
+        norm = K1 * (1 - B + B * lengths / lengths.mean()) if len(lengths) else lengths
+        weights = counts * (K1 + 1) / (counts + norm[docs])
+        order = np.lexsort((docs, codes))
+        indptr = np.concatenate([[0], np.cumsum(np.bincount(codes, minlength=len(vocabulary)))])
+        return cls(np.asarray(vocabulary, dtype=object), indptr, docs[order].astype(np.int32), weights[order].astype(np.float32), question_ids)
+
+    def __len__(self):
+        return len(self.question_ids)
+
+    def doc_codes(self, question_ids):
+        """Index position of each question ID; -1 for questions that aren't indexed."""
+        question_ids = pd.array(question_ids, dtype='Int64')
+        codes = np.full(len(question_ids), -1, dtype=np.int64)
+        codes[~question_ids.isna()] = self.question_ids.get_indexer(question_ids[~question_ids.isna()].to_numpy(dtype=np.int64))
+        return codes
+
+    def scores(self, query):
+        """BM25 score of every indexed question for `query`."""
+        scores = np.zeros(len(self), dtype=np.float64)
+        for term in query_terms(query):
+            code = self._codes.get(term)
+            if code is None:
+                continue
+            postings = slice(self.indptr[code], self.indptr[code + 1])
+            docs = self.docs[postings]
+            idf = np.log1p((len(self) - len(docs) + 0.5) / (len(docs) + 0.5))
+            scores[docs] += idf * self.weights[postings]
+        return scores
+
+    def rank(self, query, docs, k):
+        """The `k` best of the candidate `docs` (index positions, -1 never matches) as (candidate positions, scores)."""
+        scores = self.scores(query)
+        candidates = np.where(docs >= 0, scores[np.maximum(docs, 0)], 0.0)
+        matches = np.flatnonzero(candidates > 0)
+        if len(matches) > k:
+            matches = matches[np.argpartition(-candidates[matches], k - 1)[:k]]
+        # Best first; equal scores keep dataset order.
+        matches = matches[np.lexsort((matches, -candidates[matches]))]
+        return matches, candidates[matches]
+
+
+_stored = OrderedDict()
+_lock = threading.Lock()
+
+
+def stored_index(store):
+    """The index merged from `store`'s term partitions, shared by every dataset read from this store version."""
+    key = (str(store.root), store.metadata.get('dataset_version'))
+    with _lock:
+        if key in _stored:
+            _stored.move_to_end(key)
+            return _stored[key]
+    index = SearchIndex.from_terms(store.read_aggregate('terms'))
+    with _lock:
+        _stored[key] = index
+        while len(_stored) > STORED_INDEXES:
+            _stored.popitem(last=False)
+    return index
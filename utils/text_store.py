@@ -0,0 +1,93 @@
+"""Side store for the long question text (context, DAX code, accepted answer).
+
+    data/dataset/text/2023-01-<version>.arrow
+
+The text columns are only shown for the handful of questions a page lists,
+so they are kept out of the question partitions and the in-memory frame.
+Each month's text is an Arrow IPC file in zstd-compressed record batches of
+`BATCH_ROWS` rows, row-aligned with that month's question partition. Files
+are memory-mapped, so worker processes share them through the OS page cache,
+and fetching a question decompresses only its own batch. The offset index
+(question ID -> month and row) comes from the question partitions' small
+`question_id` column.
+"""
+import threading
+from collections import OrderedDict
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from utils.schema import TEXT_COLUMNS
+
+BATCH_ROWS = 256
+# Month files kept memory-mapped per store; older ones are closed.
+OPEN_FILES = 64
+
+
+def encode_text(table):
+    """IPC file bytes for a month's (question_id, text columns) table."""
+    # The batch size is recorded in the file, so files written with another
+    # `BATCH_ROWS` still resolve rows correctly.
+    table = table.replace_schema_metadata({'batch_rows': str(BATCH_ROWS)})
+    sink = pa.BufferOutputStream()
+    with pa.ipc.new_file(sink, table.schema, options=pa.ipc.IpcWriteOptions(compression='zstd')) as writer:
+        writer.write_table(table, max_chunksize=BATCH_ROWS)
+    return sink.getvalue().to_pybytes()
+
+
+def read_text(path):
+    with pa.memory_map(str(path)) as source:
+        return pa.ipc.open_file(source).read_all()
+
+
+class TextStore:
+    def __init__(self, store):
+        self.store = store
+        self._readers = OrderedDict()
+        self._index = None
+        self._lock = threading.Lock()
+
+    def _offsets(self):
+        with self._lock:
+            if self._index is None:
+                ids = self.store.read(columns=['question_id'])['question_id']
+                positions = np.flatnonzero(ids.is_valid().to_numpy(zero_copy_only=False))
+                index = pd.Index(ids.drop_null().to_numpy(), dtype='int64')
+                starts = np.cumsum([0] + [self.store.rows(month) for month in self.store.months])
+                self._index = (index, positions, starts, self.store.months)
+            return self._index
+
+    def _reader(self, month):
+        path = self.store.path('text', month)
+        with self._lock:
+            if path not in self._readers:
+                reader = pa.ipc.open_file(pa.memory_map(str(path)))
+                self._readers[path] = (reader, int(reader.schema.metadata[b'batch_rows']))
+                while len(self._readers) > OPEN_FILES:
+                    self._readers.popitem(last=False)
+            self._readers.move_to_end(path)
+            return self._readers[path]
+
+    def fetch(self, question_ids, columns=TEXT_COLUMNS):
+        """Text of the given questions, in the order asked; unknown IDs get missing values."""
+        index, positions, starts, months = self._offsets()
+        question_ids = pd.array(question_ids, dtype='Int64')
+        # A plain int64 target lets pandas reuse the index's hash table.
+        found = np.full(len(question_ids), -1, dtype=np.int64)
+        found[~question_ids.isna()] = index.get_indexer(question_ids[~question_ids.isna()].to_numpy(dtype=np.int64))
+        values = {column: [None] * len(found) for column in columns}
+        batches = {}
+        for i, position in enumerate(found):
+            if position < 0:
+                continue
+            position = positions[position]
+            month = np.searchsorted(starts, position, side='right') - 1
+            reader, batch_rows = self._reader(months[month])
+            batch, row = divmod(position - starts[month], batch_rows)
+            if (month, batch) not in batches:
+                with self._lock:
+                    batches[month, batch] = reader.get_batch(batch)
+            for column in columns:
+                values[column][i] = batches[month, batch].column(column)[row].as_py()
+        return pd.DataFrame({column: pa.array(items, type=pa.string()).to_pandas() for column, items in values.items()})